@@ -0,0 +1,91 @@
+from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional
+from .config import PanelDescriptor
+from .registry import DeviceRegistry
+from .scheduler import WriteScheduler
+
+
+class AdapterPool:
+    def __init__(
+        self,
+        adapters: Iterable[str] = (),
+        max_connecting: int = 2,
+        stagger: float = 0.2,
+        cache_ttl: float = 60.0,
+        write_window: int = 4,
+    ) -> None:
+        self.adapters: list[Optional[str]] = list(adapters) or [None]
+        self.max_connecting = max(1, max_connecting)
+        self.stagger = max(0.0, stagger)
+        self.cache_ttl = cache_ttl
+        self.write_window = write_window
+        self.registries = {adapter: DeviceRegistry(ttl=cache_ttl, adapter=adapter) for adapter in self.adapters}
+        self.assignments: dict[str, Optional[str]] = {}
+        self._gates: dict[Optional[str], asyncio.Semaphore] = {}
+        self._next_start: dict[Optional[str], float] = {}
+        self.schedulers: dict[Optional[str], WriteScheduler] = {}
+
+    def assign(self, descriptors: Iterable[PanelDescriptor]) -> dict[str, Optional[str]]:
+        load = {adapter: 0 for adapter in self.adapters}
+        automatic = []
+        for descriptor in descriptors:
+            if descriptor.adapter is None:
+                automatic.append(descriptor)
+                continue
+            if descriptor.adapter not in self.registries:
+                self.adapters.append(descriptor.adapter)
+                self.registries[descriptor.adapter] = DeviceRegistry(ttl=self.cache_ttl, adapter=descriptor.adapter)
+            self.assignments[descriptor.address.upper()] = descriptor.adapter
+            load[descriptor.adapter] = load.get(descriptor.adapter, 0) + 1
+        for descriptor in automatic:
+            adapter = min(self.adapters, key=lambda item: (load.get(item, 0), self.adapters.index(item)))
+            self.assignments[descriptor.address.upper()] = adapter
+            load[adapter] = load.get(adapter, 0) + 1
+        return dict(self.assignments)
+
+    def adapter_for(self, address: str) -> Optional[str]:
+        return self.assignments.get(address.upper(), self.adapters[0])
+
+    def scheduler_for(self, adapter: Optional[str]) -> Optional[WriteScheduler]:
+        if len(self.addresses_for(adapter)) < 2:
+            return None
+        if adapter not in self.schedulers:
+            self.schedulers[adapter] = WriteScheduler(self.write_window)
+        return self.schedulers[adapter]
+
+    def registry_for(self, adapter: Optional[str]) -> DeviceRegistry:
+        return self.registries[adapter]
+
+    def addresses_for(self, adapter: Optional[str]) -> list[str]:
+        return [address for address, assigned in self.assignments.items() if assigned == adapter]
+
+    @asynccontextmanager
+    async def connecting(self, adapter: Optional[str]) -> AsyncIterator[None]:
+        gate = self._gates.get(adapter)
+        if gate is None:
+            gate = self._gates[adapter] = asyncio.Semaphore(self.max_connecting)
+        async with gate:
+            loop = asyncio.get_running_loop()
+            start = max(loop.time(), self._next_start.get(adapter, 0.0))
+            self._next_start[adapter] = start + self.stagger
+            wait = start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+    async def discover(self, timeout: float, background: bool = False) -> None:
+        tasks = []
+        for adapter in self.adapters:
+            registry = self.registries[adapter]
+            if background:
+                await registry.start()
+            addresses = self.addresses_for(adapter)
+            if addresses:
+                tasks.append(registry.resolve_many(addresses, timeout))
+        await asyncio.gather(*tasks)
+
+    async def stop(self) -> None:
+        for registry in self.registries.values():
+            await registry.stop()
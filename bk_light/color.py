@@ -0,0 +1,34 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import cached_property
+from PIL import Image
+
+Channels = tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class ColorPipeline:
+    brightness: float = 1.0
+    gamma: Channels = (1.0, 1.0, 1.0)
+    white_balance: Channels = (1.0, 1.0, 1.0)
+
+    @property
+    def identity(self) -> bool:
+        return self.brightness == 1.0 and self.gamma == (1.0, 1.0, 1.0) and self.white_balance == (1.0, 1.0, 1.0)
+
+    @cached_property
+    def table(self) -> list[int]:
+        table: list[int] = []
+        for gamma, gain in zip(self.gamma, self.white_balance):
+            scale = 255.0 * self.brightness * gain
+            for value in range(256):
+                level = (value / 255.0) ** gamma
+                table.append(max(0, min(255, int(round(level * scale)))))
+        return table
+
+    def apply(self, image: Image.Image) -> Image.Image:
+        if self.identity:
+            return image
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return image.point(self.table)
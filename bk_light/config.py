@@ -4,12 +4,27 @@ from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Dict, Optional
 import yaml
+from .effects import EFFECTS
 
 
 def _clamp(value: float, lower: float, upper: float) -> float:
     return max(lower, min(upper, value))
 
 
+def _channels(value: Any, default: float, lower: float, upper: float) -> tuple[float, float, float]:
+    if value is None:
+        return (default, default, default)
+    if isinstance(value, (int, float)):
+        values = [float(value)] * 3
+    else:
+        values = [float(item) for item in value]
+        if len(values) == 1:
+            values = values * 3
+        if len(values) != 3:
+            raise ValueError(f"Expected one or three channel values, got {value!r}")
+    return tuple(_clamp(item, lower, upper) for item in values)
+
+
 def _load_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
@@ -55,6 +70,9 @@ class TextPreset:
     offset_x: int = 0
     offset_y: int = 0
     interval: float = 0.05
+    effect: str = "solid"
+    accent: str = "#0000FF"
+    effect_period: float = 2.0
 
 
 @dataclass
@@ -77,19 +95,54 @@ class DeviceConfig:
     address: Optional[str] = None
     auto_reconnect: bool = True
     reconnect_delay: float = 2.0
+    reconnect_backoff_max: float = 30.0
+    breaker_threshold: int = 3
+    breaker_cooldown: float = 30.0
+    keepalive: bool = False
+    keepalive_interval: float = 20.0
+    adapters: list[str] = field(default_factory=list)
+    max_connecting: int = 2
+    connect_stagger: float = 0.2
     mtu: int = 512
     rotate: int = 0
     brightness: float = 0.85
     timezone: str = "auto"
     scan_timeout: float = 6.0
+    gamma: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    white_balance: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    cache_ttl: float = 60.0
+    background_scan: bool = False
 
 
 @dataclass
 class DisplayConfig:
     frame_interval: float = 5.0
     max_retries: int = 3
+    frame_retries: int = 1
+    handshake_retries: int = 1
+    ack_timeout: float = 5.0
     log_notifications: bool = False
     antialias_text: bool = True
+    streaming: bool = False
+    adaptive_pacing: bool = True
+    queue_depth: int = 1
+    frame_deadline: Optional[float] = None
+    png_strategy: str = "rgb"
+    frame_cache_bytes: int = 262144
+    prepare_workers: int = 4
+    min_panels: Optional[int] = None
+    sync_commit: bool = False
+    sync_timeout: float = 1.0
+    write_scheduling: bool = False
+    write_window: int = 4
+    write_strategy: str = "auto"
+    chunk_window: int = 8
+    chunk_pause: float = 0.005
+    skip_unchanged: bool = True
+    refresh_interval: float = 30.0
+    metrics_jsonl: Optional[str] = None
+    metrics_prometheus: Optional[str] = None
+    metrics_interval: float = 10.0
 
 
 @dataclass
@@ -100,6 +153,10 @@ class PanelDescriptor:
     grid_y: int = 0
     rotation: Optional[int] = None
     brightness: Optional[float] = None
+    gamma: Optional[tuple[float, float, float]] = None
+    white_balance: Optional[tuple[float, float, float]] = None
+    adapter: Optional[str] = None
+    priority: int = 0
 
 
 @dataclass
@@ -109,6 +166,7 @@ class PanelsConfig:
     columns: int = 1
     rows: int = 1
     items: list[PanelDescriptor] = field(default_factory=list)
+    resample: str = "bicubic"
 
 
 @dataclass
@@ -140,23 +198,59 @@ DEFAULTS: Dict[str, Any] = {
         "address": None,
         "auto_reconnect": True,
         "reconnect_delay": 2.0,
+        "reconnect_backoff_max": 30.0,
+        "breaker_threshold": 3,
+        "breaker_cooldown": 30.0,
+        "keepalive": False,
+        "keepalive_interval": 20.0,
+        "adapters": [],
+        "max_connecting": 2,
+        "connect_stagger": 0.2,
         "mtu": 512,
         "rotate": 0,
         "brightness": 0.85,
         "timezone": "auto",
         "scan_timeout": 6.0,
+        "gamma": 1.0,
+        "white_balance": [1.0, 1.0, 1.0],
+        "cache_ttl": 60.0,
+        "background_scan": False,
     },
     "panels": {
         "tile_width": 32,
         "tile_height": 32,
         "layout": {"columns": 1, "rows": 1},
         "list": [],
+        "resample": "bicubic",
     },
     "display": {
         "frame_interval": 5.0,
         "max_retries": 3,
+        "frame_retries": 1,
+        "handshake_retries": 1,
+        "ack_timeout": 5.0,
         "log_notifications": False,
         "antialias_text": True,
+        "streaming": False,
+        "adaptive_pacing": True,
+        "queue_depth": 1,
+        "frame_deadline": None,
+        "png_strategy": "rgb",
+        "frame_cache_bytes": 262144,
+        "prepare_workers": 4,
+        "min_panels": None,
+        "sync_commit": False,
+        "sync_timeout": 1.0,
+        "write_scheduling": False,
+        "write_window": 4,
+        "write_strategy": "auto",
+        "chunk_window": 8,
+        "chunk_pause": 0.005,
+        "skip_unchanged": True,
+        "refresh_interval": 30.0,
+        "metrics_jsonl": None,
+        "metrics_prometheus": None,
+        "metrics_interval": 10.0,
     },
     "presets": {
         "clock": {
@@ -187,6 +281,9 @@ DEFAULTS: Dict[str, Any] = {
                 "offset_x": 0,
                 "offset_y": 0,
                 "interval": 0.05,
+                "effect": "solid",
+                "accent": "#0000FF",
+                "effect_period": 2.0,
             }
         },
         "image": {
@@ -237,6 +334,8 @@ def _build_text_presets(data: Dict[str, Dict[str, Any]]) -> Dict[str, TextPreset
             preset = replace(preset, mode="static")
         if preset.direction not in {"left", "right"}:
             preset = replace(preset, direction="left")
+        if preset.effect not in EFFECTS:
+            preset = replace(preset, effect="solid")
         speed = max(1.0, float(preset.speed))
         gap = max(0, int(preset.gap))
         offset_x = int(preset.offset_x)
@@ -254,6 +353,7 @@ def _build_text_presets(data: Dict[str, Dict[str, Any]]) -> Dict[str, TextPreset
             offset_y=offset_y,
             interval=interval,
             step=computed_step,
+            effect_period=float(preset.effect_period),
         )
         presets[name] = preset
     if "default" not in presets:
@@ -302,6 +402,10 @@ def _build_panels(data: Dict[str, Any]) -> PanelsConfig:
             grid_y = 0
             rotation = None
             brightness = None
+            gamma = None
+            white_balance = None
+            adapter = None
+            priority = 0
         elif isinstance(entry, dict):
             name = entry.get("name") or f"panel_{len(items) + 1}"
             address = entry.get("address")
@@ -315,6 +419,16 @@ def _build_panels(data: Dict[str, Any]) -> PanelsConfig:
             brightness = entry.get("brightness")
             if brightness is not None:
                 brightness = _clamp(float(brightness), 0.1, 1.0)
+            gamma = entry.get("gamma")
+            if gamma is not None:
+                gamma = _channels(gamma, 1.0, 0.1, 5.0)
+            white_balance = entry.get("white_balance")
+            if white_balance is not None:
+                white_balance = _channels(white_balance, 1.0, 0.0, 2.0)
+            adapter = entry.get("adapter")
+            if adapter is not None:
+                adapter = str(adapter)
+            priority = int(entry.get("priority", 0))
         else:
             continue
         items.append(
@@ -325,6 +439,10 @@ def _build_panels(data: Dict[str, Any]) -> PanelsConfig:
                 grid_y=grid_y,
                 rotation=rotation,
                 brightness=brightness,
+                gamma=gamma,
+                white_balance=white_balance,
+                adapter=adapter,
+                priority=priority,
             )
         )
         max_x = max(max_x, grid_x)
@@ -339,6 +457,7 @@ def _build_panels(data: Dict[str, Any]) -> PanelsConfig:
         columns=columns,
         rows=rows,
         items=items,
+        resample=str(data.get("resample", "bicubic")).lower(),
     )
 
 
@@ -352,7 +471,15 @@ def load_config(path: Optional[Path] = None) -> AppConfig:
     scan_timeout = max(1.0, device.scan_timeout)
     if device.rotate not in {0, 90, 180, 270}:
         device = replace(device, rotate=0)
-    device = replace(device, brightness=brightness, scan_timeout=scan_timeout)
+    device = replace(
+        device,
+        brightness=brightness,
+        scan_timeout=scan_timeout,
+        gamma=_channels(device.gamma, 1.0, 0.1, 5.0),
+        white_balance=_channels(device.white_balance, 1.0, 0.0, 2.0),
+        cache_ttl=max(0.0, device.cache_ttl),
+        adapters=[str(adapter) for adapter in device.adapters or []],
+    )
     env_address = os.getenv("BK_LIGHT_ADDRESS")
     if env_address:
         device = replace(device, address=env_address)
@@ -403,7 +530,7 @@ def text_options(config: AppConfig, preset_name: str, overrides: Dict[str, Any])
             continue
         if key in {"size", "spacing", "gap", "offset_x", "offset_y", "step"}:
             data[key] = int(value)
-        elif key in {"speed", "interval"}:
+        elif key in {"speed", "interval", "effect_period"}:
             data[key] = float(value)
         else:
             data[key] = value
@@ -412,6 +539,8 @@ def text_options(config: AppConfig, preset_name: str, overrides: Dict[str, Any])
         preset = replace(preset, mode="static")
     if preset.direction not in {"left", "right"}:
         preset = replace(preset, direction="left")
+    if preset.effect not in EFFECTS:
+        preset = replace(preset, effect="solid")
     speed = max(1.0, float(preset.speed))
     interval = max(0.01, float(preset.interval))
     if preset.step is None:
@@ -1,11 +1,22 @@
 import asyncio
 import binascii
 import os
+import random
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass
 from io import BytesIO
-from typing import Optional
-from bleak import BleakClient, BleakScanner
+from typing import AsyncContextManager, Callable, Optional
 from bleak.exc import BleakError
-from PIL import Image, ImageEnhance
+from PIL import Image
+from .color import ColorPipeline
+from .encoder import PngEncoder
+from .frame_cache import FrameCache
+from .layout import orient
+from .metrics import Metrics
+from .registry import DeviceRegistry
+from .scheduler import WriteScheduler
+from .transport import BleakTransport, Transport, TransportFactory
 
 DEFAULT_ADDRESS = os.getenv("BK_LIGHT_ADDRESS")
 UUID_WRITE = "0000fa02-0000-1000-8000-00805f9b34fb"
@@ -16,6 +27,7 @@ ACK_STAGE_ONE = bytes.fromhex("0C 00 01 80 81 06 32 00 00 01 00 01")
 ACK_STAGE_TWO = bytes.fromhex("08 00 05 80 0B 03 07 02")
 ACK_STAGE_THREE = bytes.fromhex("05 00 02 00 03")
 FRAME_VALIDATION = bytes.fromhex("05 00 00 01 00")
+WRITE_STRATEGIES = ("auto", "single", "chunked")
 
 
 def bytes_to_hex(data: bytes) -> str:
@@ -37,18 +49,27 @@ def build_frame(png_bytes: bytes) -> bytes:
     return bytes(frame)
 
 
-def adjust_image(png_bytes: bytes, rotation: int, brightness: float) -> bytes:
-    image = Image.open(BytesIO(png_bytes)).convert("RGB")
-    if rotation:
-        image = image.rotate(rotation % 360, expand=False)
-    if brightness != 1.0:
-        enhancer = ImageEnhance.Brightness(image)
-        image = enhancer.enhance(brightness)
+def prepare_image(image: Image.Image, rotation: int, color: ColorPipeline) -> Image.Image:
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return color.apply(orient(image, rotation))
+
+
+def encode_png(image: Image.Image) -> bytes:
     buffer = BytesIO()
     image.save(buffer, format="PNG", optimize=False)
     return buffer.getvalue()
 
 
+def frame_checksum(frame: bytes) -> int:
+    return int.from_bytes(frame[9:13], "little")
+
+
+def adjust_image(png_bytes: bytes, rotation: int, brightness: float) -> bytes:
+    image = Image.open(BytesIO(png_bytes)).convert("RGB")
+    return encode_png(prepare_image(image, rotation, ColorPipeline(brightness=brightness)))
+
+
 class AckWatcher:
     def __init__(self, verbose: bool) -> None:
         self.stage_one = asyncio.Event()
@@ -73,15 +94,243 @@ class AckWatcher:
             self.stage_three.set()
 
 
-async def wait_for_ack(event: asyncio.Event, label: str, verbose: bool) -> None:
+async def wait_for_ack(
+    event: asyncio.Event,
+    label: str,
+    verbose: bool,
+    timeout: float = 5.0,
+    lost: Optional[asyncio.Event] = None,
+) -> float:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    waiters = [loop.create_task(event.wait())]
+    if lost is not None:
+        waiters.append(loop.create_task(lost.wait()))
     try:
-        await asyncio.wait_for(event.wait(), timeout=5.0)
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+    if event.is_set():
         if verbose:
             print(label + "_OK")
-    except asyncio.TimeoutError as timeout_error:
+        return loop.time() - started
+    if lost is not None and lost.is_set():
         if verbose:
-            print(label + "_TIMEOUT")
-        raise timeout_error
+            print(label + "_LINK_LOST")
+        raise ConnectionError(f"Bluetooth link lost while waiting for {label}")
+    if verbose:
+        print(label + "_TIMEOUT")
+    raise asyncio.TimeoutError()
+
+
+class AckPacer:
+    def __init__(
+        self,
+        min_settle: float = 0.0,
+        max_settle: float = 1.0,
+        smoothing: float = 0.25,
+        decay: float = 0.75,
+        backoff: float = 2.0,
+        rtt_factor: float = 1.5,
+    ) -> None:
+        self.min_settle = min_settle
+        self.max_settle = max_settle
+        self.smoothing = smoothing
+        self.decay = decay
+        self.backoff = backoff
+        self.rtt_factor = rtt_factor
+        self.rtt: dict[str, float] = {}
+        self.settle: dict[str, float] = {}
+        self.required: dict[str, float] = {}
+
+    def floor(self, stage: str) -> float:
+        observed = self.rtt_factor * self.rtt.get(stage, 0.0)
+        return min(self.max_settle, max(self.min_settle, self.required.get(stage, 0.0), observed))
+
+    def settle_time(self, stage: str, delay: float) -> float:
+        current = self.settle.setdefault(stage, min(self.max_settle, max(self.min_settle, delay)))
+        return max(current, self.floor(stage))
+
+    def observe(self, stage: str, elapsed: float) -> None:
+        previous = self.rtt.get(stage)
+        if previous is None:
+            self.rtt[stage] = elapsed
+        else:
+            self.rtt[stage] = previous + self.smoothing * (elapsed - previous)
+
+    def confirm(self, stage: Optional[str]) -> None:
+        if stage is None or stage not in self.settle:
+            return
+        self.settle[stage] = max(self.floor(stage), self.settle[stage] * self.decay)
+
+    def penalize(self, stage: Optional[str]) -> None:
+        if stage is None:
+            return
+        current = self.settle.get(stage, self.min_settle)
+        bumped = min(self.max_settle, max(current * self.backoff, 0.05))
+        self.required[stage] = 0.5 * (current + bumped)
+        self.settle[stage] = bumped
+
+
+class CircuitOpenError(ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+
+    def state(self, now: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self, now: float) -> bool:
+        self.failures += 1
+        if self.threshold <= 0:
+            return False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            self.opened_at = now
+            self.trips += 1
+            return True
+        return False
+
+
+def backoff_delay(base: float, attempt: int, limit: float) -> float:
+    ceiling = min(limit, base * (2 ** max(0, attempt - 1)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class CommitBarrier:
+    def __init__(
+        self,
+        parties: int,
+        timeout: float,
+        on_complete: Optional[Callable[["CommitBarrier"], None]] = None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        self.parties = parties
+        self.created = loop.time()
+        self.deadline = self.created + timeout
+        self.on_complete = on_complete
+        self.released = asyncio.Event()
+        self.released_at: Optional[float] = None
+        self.timed_out = False
+        self.arrived: set[str] = set()
+        self.late: set[str] = set()
+        self.abandoned: set[str] = set()
+        self.finished: dict[str, float] = {}
+        self.completed = False
+
+    @property
+    def skew(self) -> float:
+        if len(self.finished) < 2:
+            return 0.0
+        return max(self.finished.values()) - min(self.finished.values())
+
+    @property
+    def missed(self) -> set[str]:
+        return self.late | (self.abandoned - self.finished.keys())
+
+    async def arrive(self, name: str) -> bool:
+        if self.released.is_set():
+            self.late.add(name)
+            return False
+        self.arrived.add(name)
+        self._check_release()
+        remaining = self.deadline - asyncio.get_running_loop().time()
+        try:
+            await asyncio.wait_for(self.released.wait(), timeout=max(0.0, remaining))
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            self._release()
+        return True
+
+    def finish(self, name: str) -> None:
+        self.finished[name] = asyncio.get_running_loop().time()
+        self._check_complete()
+
+    def abandon(self, name: str) -> None:
+        if name in self.finished or name in self.abandoned:
+            return
+        self.abandoned.add(name)
+        self._check_release()
+        self._check_complete()
+
+    def _release(self) -> None:
+        if not self.released.is_set():
+            self.released_at = asyncio.get_running_loop().time()
+            self.released.set()
+
+    def _check_release(self) -> None:
+        if len(self.arrived | self.abandoned) >= self.parties:
+            self._release()
+
+    def _check_complete(self) -> None:
+        if self.completed or len(self.finished.keys() | self.abandoned) < self.parties:
+            return
+        self.completed = True
+        if self.on_complete is not None:
+            self.on_complete(self)
+
+
+@dataclass
+class PendingFrame:
+    frame: bytes
+    delay: float
+    deadline: Optional[float]
+    future: asyncio.Future
+    barrier: Optional[CommitBarrier] = None
+
+
+class FrameQueue:
+    def __init__(self, capacity: int = 1) -> None:
+        self.capacity = max(1, capacity)
+        self.pending: deque[PendingFrame] = deque()
+        self.ready = asyncio.Event()
+        self.in_flight: Optional[PendingFrame] = None
+        self.sent = 0
+        self.dropped = 0
+        self.expired = 0
+
+    @property
+    def idle(self) -> bool:
+        return not self.pending and self.in_flight is None
+
+    def put(self, item: PendingFrame) -> None:
+        while len(self.pending) >= self.capacity:
+            stale = self.pending.popleft()
+            self.dropped += 1
+            if not stale.future.done():
+                stale.future.set_result(False)
+        self.pending.append(item)
+        self.ready.set()
+
+    async def get(self) -> PendingFrame:
+        while not self.pending:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.pending.popleft()
+
+    def clear(self) -> None:
+        while self.pending:
+            stale = self.pending.popleft()
+            if not stale.future.done():
+                stale.future.cancel()
+
+    def stats(self) -> dict[str, int]:
+        return {"sent": self.sent, "dropped": self.dropped, "expired": self.expired, "pending": len(self.pending)}
 
 
 class BleDisplaySession:
@@ -96,138 +345,565 @@ class BleDisplaySession:
         log_notifications: bool = False,
         max_retries: int = 3,
         scan_timeout: float = 6.0,
+        streaming: bool = False,
+        adaptive_pacing: bool = True,
+        queue_depth: int = 1,
+        gamma: tuple[float, float, float] = (1.0, 1.0, 1.0),
+        white_balance: tuple[float, float, float] = (1.0, 1.0, 1.0),
+        encoder: Optional[PngEncoder] = None,
+        frame_cache: Optional[FrameCache] = None,
+        transport_factory: Optional[TransportFactory] = None,
+        metrics: Optional[Metrics] = None,
+        name: Optional[str] = None,
+        registry: Optional[DeviceRegistry] = None,
+        frame_retries: int = 1,
+        handshake_retries: int = 1,
+        reconnect_backoff_max: float = 30.0,
+        breaker_threshold: int = 3,
+        breaker_cooldown: float = 30.0,
+        keepalive: bool = False,
+        keepalive_interval: float = 20.0,
+        adapter: Optional[str] = None,
+        connect_slot: Optional[Callable[[], AsyncContextManager[None]]] = None,
+        scheduler: Optional[WriteScheduler] = None,
+        priority: int = 0,
+        write_strategy: str = "auto",
+        chunk_window: int = 8,
+        chunk_pause: float = 0.005,
+        reprobe_interval: int = 64,
+        ack_timeout: float = 5.0,
     ) -> None:
         resolved = address or DEFAULT_ADDRESS
         if not resolved:
             raise ValueError("Missing target address. Pass it explicitly or set BK_LIGHT_ADDRESS.")
         self.address = resolved
+        self.name = name or resolved
         self.auto_reconnect = auto_reconnect
         self.reconnect_delay = reconnect_delay
         self.rotation = rotation
         self.brightness = brightness
+        self.color = ColorPipeline(brightness, tuple(gamma), tuple(white_balance))
+        self.encoder = encoder or PngEncoder()
+        self.frame_cache = frame_cache
         self.mtu = mtu
         self.log_notifications = log_notifications
         self.max_retries = max_retries
         self.scan_timeout = scan_timeout
-        self.client: Optional[BleakClient] = None
+        self.streaming = streaming
+        self.handshaken = False
+        self.connections = 0
+        self.pacer: Optional[AckPacer] = AckPacer() if adaptive_pacing else None
+        self._settled_stage: Optional[str] = None
+        self.transport_factory = transport_factory or BleakTransport
+        self.registry = registry
+        self.transport: Optional[Transport] = None
+        self.metrics = metrics or Metrics()
         self.watcher = AckWatcher(log_notifications)
+        self.queue = FrameQueue(queue_depth)
+        self._sender: Optional[asyncio.Task] = None
+        self.frame_retries = max(0, frame_retries)
+        self.handshake_retries = max(0, handshake_retries)
+        self.reconnect_backoff_max = max(reconnect_delay, reconnect_backoff_max)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.keepalive = keepalive
+        self.keepalive_interval = max(1.0, keepalive_interval)
+        self.connected_at: Optional[float] = None
+        self.uptime_total = 0.0
+        self.link_drops = 0
+        self.last_activity = 0.0
+        self._link_lost = asyncio.Event()
+        self._connect_lock = asyncio.Lock()
+        self._io_lock = asyncio.Lock()
+        self._keepalive: Optional[asyncio.Task] = None
+        self.adapter = adapter
+        self.connect_slot = connect_slot
+        self.scheduler = scheduler
+        self.priority = priority
+        if write_strategy not in WRITE_STRATEGIES:
+            raise ValueError(f"Unknown write strategy '{write_strategy}'")
+        self.write_strategy = write_strategy
+        self.chunk_window = max(1, chunk_window)
+        self.chunk_pause = max(0.0, chunk_pause)
+        self.reprobe_interval = reprobe_interval
+        self.ack_timeout = ack_timeout
+        self.negotiated_mtu: Optional[int] = None
+        self.throughput: dict[str, float] = {}
+        self.chunking_disabled = False
+        self._chunk_timeouts = 0
+        self._transfers = 0
+        if scheduler is not None:
+            scheduler.register(self.name, priority)
+
+    def uptime(self) -> float:
+        if self.connected_at is None:
+            return 0.0
+        return asyncio.get_running_loop().time() - self.connected_at
+
+    def _close_link(self) -> None:
+        if self.connected_at is None:
+            return
+        duration = self.uptime()
+        self.uptime_total += duration
+        self.connected_at = None
+        self.metrics.observe(self.name, "link_uptime", duration)
+
+    def _on_transport_lost(self, transport: Transport) -> None:
+        if transport is not self.transport:
+            return
+        self.link_drops += 1
+        self.handshaken = False
+        self._settled_stage = None
+        self._close_link()
+        self.metrics.increment(self.name, "link_drops")
+        if self.log_notifications:
+            print("LINK_LOST")
+        self._link_lost.set()
 
     async def _safe_disconnect(self) -> None:
-        if self.client is None:
+        transport = self.transport
+        if transport is None:
             return
+        self.transport = None
+        self.handshaken = False
+        self._settled_stage = None
+        self._close_link()
         try:
-            if self.client.is_connected:
+            if transport.is_connected:
                 try:
-                    await self.client.stop_notify(UUID_NOTIFY)
+                    await transport.stop_notify(UUID_NOTIFY)
                 except Exception:
                     pass
                 await asyncio.sleep(0.1)
-            await self.client.disconnect()
+            await transport.disconnect()
         except Exception:
             pass
-        finally:
-            self.client = None
 
-    async def _connect(self) -> None:
+    async def _connect(self, retries: Optional[int] = None) -> None:
+        retries = self.max_retries if retries is None else retries
         attempt = 0
         while True:
             attempt += 1
             try:
-                if self.client and self.client.is_connected:
+                if self.transport and self.transport.is_connected:
                     return
-                if self.client:
+                if self.transport:
                     await self._safe_disconnect()
-                try:
-                    device = await BleakScanner.find_device_by_address(
-                        self.address, timeout=self.scan_timeout, cached=False
-                    )
-                except TypeError:
-                    device = await BleakScanner.find_device_by_address(
-                        self.address, timeout=self.scan_timeout
-                    )
-                if device is None:
-                    try:
-                        device = await BleakScanner.find_device_by_address(
-                            self.address, timeout=self.scan_timeout, cached=True
-                        )
-                    except TypeError:
-                        device = await BleakScanner.find_device_by_address(
-                            self.address, timeout=self.scan_timeout
-                        )
-                if device is None:
-                    raise BleakError(f"Device with address {self.address} was not found")
-                self.client = BleakClient(device)
+                self.transport = self.transport_factory(
+                    self.address,
+                    scan_timeout=self.scan_timeout,
+                    registry=self.registry,
+                    on_disconnect=self._on_transport_lost,
+                    adapter=self.adapter,
+                )
                 self.watcher = AckWatcher(self.log_notifications)
-                await self.client.connect()
-                if not self.client.is_connected:
+                self.handshaken = False
+                async with self.connect_slot() if self.connect_slot else nullcontext():
+                    await self.transport.connect()
+                if not self.transport.is_connected:
                     raise ConnectionError("Bluetooth link failed")
                 if self.mtu:
                     try:
-                        await self.client.exchange_mtu(self.mtu)
-                    except Exception:
-                        pass
-                await self.client.start_notify(UUID_NOTIFY, self.watcher.handler)
+                        await self.transport.exchange_mtu(self.mtu)
+                    except Exception as mtu_error:
+                        self.metrics.increment(self.name, "mtu_exchange_failures")
+                        if self.log_notifications:
+                            print("MTU_EXCHANGE_FAILED", repr(mtu_error))
+                self.negotiated_mtu = self.transport.mtu_size
+                if self.log_notifications:
+                    print("MTU", self.negotiated_mtu)
+                await self.transport.start_notify(UUID_NOTIFY, self.watcher.handler)
+                if self.connections:
+                    self.metrics.increment(self.name, "reconnects")
+                self.connections += 1
+                self.connected_at = asyncio.get_running_loop().time()
+                self.last_activity = self.connected_at
+                self._link_lost.clear()
                 return
             except Exception as error:
-                if not self.auto_reconnect or attempt > self.max_retries:
+                if not self.auto_reconnect or attempt > retries:
                     await self._safe_disconnect()
                     raise error
-                await asyncio.sleep(self.reconnect_delay)
+                await asyncio.sleep(self._backoff(attempt))
 
-    async def _ensure_connected(self) -> None:
-        if not self.client or not self.client.is_connected:
-            await self._connect()
+    def _backoff(self, attempt: int) -> float:
+        return backoff_delay(self.reconnect_delay, attempt, self.reconnect_backoff_max)
+
+    async def _ensure_connected(self, retries: Optional[int] = None) -> None:
+        if self.transport and self.transport.is_connected:
+            return
+        async with self._connect_lock:
+            if not self.transport or not self.transport.is_connected:
+                await self._connect(retries)
 
     async def __aenter__(self) -> "BleDisplaySession":
-        await self._connect()
+        await self._ensure_connected()
+        if self.keepalive:
+            self._keepalive = asyncio.get_running_loop().create_task(self._run_keepalive())
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop_keepalive()
+        await self.stop_sender()
         await self._safe_disconnect()
 
-    async def send_png(self, png_bytes: bytes, delay: float = 0.2) -> None:
-        processed = adjust_image(png_bytes, self.rotation, self.brightness)
-        frame = build_frame(processed)
-        await self.send_frame(frame, delay)
+    async def stop_keepalive(self) -> None:
+        if self._keepalive is None:
+            return
+        self._keepalive.cancel()
+        try:
+            await self._keepalive
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._keepalive = None
 
-    async def send_frame(self, frame: bytes, delay: float = 0.2) -> None:
+    async def _run_keepalive(self) -> None:
+        loop = asyncio.get_running_loop()
         attempt = 0
         while True:
-            attempt += 1
             try:
-                await self._ensure_connected()
-                self.watcher.reset()
-                await self.client.write_gatt_char(UUID_WRITE, HANDSHAKE_FIRST, response=False)
-                await wait_for_ack(self.watcher.stage_one, "HANDSHAKE_STAGE_ONE", self.log_notifications)
-                await asyncio.sleep(delay)
-                self.watcher.stage_two.clear()
-                skip_stage_two = False
+                await asyncio.wait_for(self._link_lost.wait(), timeout=self.keepalive_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self.transport is None or not self.transport.is_connected:
+                now = loop.time()
+                if self.breaker.state(now) == "open":
+                    await asyncio.sleep(self.breaker.cooldown - (now - self.breaker.opened_at))
+                    continue
+                attempt += 1
+                reconnected = False
                 try:
-                    await self.client.write_gatt_char(UUID_WRITE, HANDSHAKE_SECOND, response=False)
-                    await wait_for_ack(self.watcher.stage_two, "HANDSHAKE_STAGE_TWO", self.log_notifications)
-                except asyncio.TimeoutError:
-                    skip_stage_two = True
+                    async with self._io_lock:
+                        connections = self.connections
+                        await self._ensure_connected(0)
+                        reconnected = self.connections > connections
+                except Exception:
+                    self.metrics.increment(self.name, "keepalive_failures")
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                attempt = 0
+                if reconnected:
+                    self.metrics.increment(self.name, "keepalive_reconnects")
+            elif loop.time() - self.last_activity >= self.keepalive_interval:
+                await self._ping()
+
+    async def _ping(self) -> None:
+        if self._io_lock.locked():
+            return
+        async with self._io_lock:
+            self.handshaken = False
+            self.watcher.stage_one.clear()
+            try:
+                await self._write(HANDSHAKE_FIRST, response=False)
+                await self._await_ack(self.watcher.stage_one, "KEEPALIVE")
+            except Exception:
+                self.metrics.increment(self.name, "keepalive_failures")
+                await self._safe_disconnect()
+                self._link_lost.set()
+            else:
+                self.metrics.increment(self.name, "keepalive_pings")
+
+    async def send_png(self, png_bytes: bytes, delay: float = 0.2) -> None:
+        await self.send_image(Image.open(BytesIO(png_bytes)), delay)
+
+    def build_image_frame(self, image: Image.Image) -> bytes:
+        key: Optional[bytes] = None
+        if self.frame_cache is not None:
+            key = FrameCache.key(image, self.rotation, self.color)
+            cached = self.frame_cache.get(key)
+            if cached is not None:
+                return cached
+        with self.metrics.span(self.name, "encode"):
+            png_bytes = self.encoder.encode(prepare_image(image, self.rotation, self.color))
+        with self.metrics.span(self.name, "crc"):
+            frame = build_frame(png_bytes)
+        if key is not None:
+            self.frame_cache.put(key, frame)
+        return frame
+
+    async def send_image(self, image: Image.Image, delay: float = 0.2) -> None:
+        await self.send_frame(self.build_image_frame(image), delay)
+
+    async def send_pixels(self, pixels: bytes, size: tuple[int, int], delay: float = 0.2) -> None:
+        image = Image.frombuffer("RGB", size, pixels, "raw", "RGB", 0, 1)
+        await self.send_image(image, delay)
+
+    def submit_png(self, png_bytes: bytes, delay: float = 0.2, deadline: Optional[float] = None) -> asyncio.Future:
+        return self.submit_image(Image.open(BytesIO(png_bytes)), delay, deadline)
+
+    def submit_image(self, image: Image.Image, delay: float = 0.2, deadline: Optional[float] = None) -> asyncio.Future:
+        return self.submit_frame(self.build_image_frame(image), delay, deadline)
+
+    def submit_frame(
+        self,
+        frame: bytes,
+        delay: float = 0.2,
+        deadline: Optional[float] = None,
+        barrier: Optional[CommitBarrier] = None,
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self._sender is None or self._sender.done():
+            self._sender = loop.create_task(self._run_sender())
+        future = loop.create_future()
+        expires = loop.time() + deadline if deadline is not None else None
+        if barrier is not None:
+            future.add_done_callback(lambda _future: barrier.abandon(self.name))
+        self.queue.put(PendingFrame(frame, delay, expires, future, barrier))
+        return future
+
+    async def stop_sender(self) -> None:
+        self.queue.clear()
+        if self._sender is None:
+            return
+        self._sender.cancel()
+        try:
+            await self._sender
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._sender = None
+
+    async def _run_sender(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            if item.future.done():
+                continue
+            if item.deadline is not None and loop.time() > item.deadline:
+                self.queue.expired += 1
+                item.future.set_result(False)
+                continue
+            self.queue.in_flight = item
+            try:
+                await self.send_frame(item.frame, item.delay, item.barrier)
+            except asyncio.CancelledError:
+                item.future.cancel()
+                raise
+            except Exception as error:
+                if not item.future.done():
+                    item.future.set_exception(error)
+            else:
+                self.queue.sent += 1
+                if not item.future.done():
+                    item.future.set_result(True)
+            finally:
+                self.queue.in_flight = None
+
+    async def _settle(self, stage: str, delay: float) -> None:
+        pause = self.pacer.settle_time(stage, delay) if self.pacer else delay
+        self._settled_stage = stage
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def _await_ack(self, event: asyncio.Event, label: str, stage: Optional[str] = None) -> None:
+        settled = self._settled_stage
+        self._settled_stage = None
+        try:
+            elapsed = await wait_for_ack(event, label, self.log_notifications, self.ack_timeout, self._link_lost)
+        except asyncio.TimeoutError:
+            self.metrics.increment(self.name, "ack_timeouts")
+            if self.pacer:
+                self.pacer.penalize(settled)
+            raise
+        if self.pacer:
+            if stage is not None:
+                self.pacer.observe(stage, elapsed)
+            self.pacer.confirm(settled)
+
+    async def _write(self, data: bytes, response: bool) -> None:
+        if self.scheduler is None:
+            await self.transport.write(UUID_WRITE, data, response=response)
+        else:
+            with self.metrics.span(self.name, "write_wait"):
+                await self.scheduler.acquire(self.name, len(data))
+            try:
+                await self.transport.write(UUID_WRITE, data, response=response)
+            finally:
+                self.scheduler.release(self.name)
+        self.last_activity = asyncio.get_running_loop().time()
+        self.metrics.increment(self.name, "bytes_written", len(data))
+
+    async def _handshake(self, delay: float) -> None:
+        self.watcher.reset()
+        await self._write(HANDSHAKE_FIRST, response=False)
+        await self._await_ack(self.watcher.stage_one, "HANDSHAKE_STAGE_ONE", "stage_one")
+        await self._settle("stage_one", delay)
+        self.watcher.stage_two.clear()
+        try:
+            await self._write(HANDSHAKE_SECOND, response=False)
+            await self._await_ack(self.watcher.stage_two, "HANDSHAKE_STAGE_TWO", "stage_two")
+        except asyncio.TimeoutError:
+            self.metrics.increment(self.name, "stage_two_skipped")
+            if self.log_notifications:
+                print("HANDSHAKE_STAGE_TWO_SKIPPED")
+        await self._settle("stage_two", delay)
+
+    async def _push_frame(self, frame: bytes, barrier: Optional[CommitBarrier] = None) -> None:
+        self.watcher.stage_three.clear()
+        if barrier is not None and self.name not in barrier.arrived | barrier.late:
+            with self.metrics.span(self.name, "barrier"):
+                await barrier.arrive(self.name)
+        strategy = self._pick_strategy(len(frame))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with self.metrics.span(self.name, "write"):
+            if strategy == "chunked":
+                strategy = await self._write_chunks(frame)
+            else:
+                await self._write(frame, response=True)
+        try:
+            with self.metrics.span(self.name, "ack"):
+                await self._await_ack(self.watcher.stage_three, "FRAME_ACK", "frame")
+        except asyncio.TimeoutError:
+            if strategy == "chunked":
+                self._chunk_failed()
+            raise
+        if barrier is not None:
+            barrier.finish(self.name)
+        if strategy == "chunked":
+            self._chunk_timeouts = 0
+        self._record_transfer(strategy, len(frame), loop.time() - started)
+
+    def _chunk_size(self) -> int:
+        return max(20, (self.negotiated_mtu or self.transport.mtu_size) - 3)
+
+    def _pick_strategy(self, size: int) -> str:
+        if self.write_strategy == "single" or self.chunking_disabled:
+            return "single"
+        if self.write_strategy == "chunked":
+            return "chunked"
+        if size <= self._chunk_size():
+            return "single"
+        for strategy in ("single", "chunked"):
+            if strategy not in self.throughput:
+                return strategy
+        self._transfers += 1
+        ranked = sorted(self.throughput, key=self.throughput.get, reverse=True)
+        if self.reprobe_interval > 0 and self._transfers % self.reprobe_interval == 0:
+            return ranked[-1]
+        return ranked[0]
+
+    async def _write_chunks(self, frame: bytes) -> str:
+        size = self._chunk_size()
+        for index, offset in enumerate(range(0, len(frame), size)):
+            if index and index % self.chunk_window == 0:
+                await asyncio.sleep(self.chunk_pause)
+            try:
+                await self._write(frame[offset : offset + size], response=False)
+            except BleakError:
+                if not self.transport.is_connected:
+                    raise
+                self._chunk_failed(rejected=True)
+                if index or not self.chunking_disabled:
+                    raise
+                await self._write(frame, response=True)
+                return "single"
+        return "chunked"
+
+    def _chunk_failed(self, rejected: bool = False) -> None:
+        self._chunk_timeouts += 1
+        self.metrics.increment(self.name, "chunk_failures")
+        if self.write_strategy != "auto" or self.chunking_disabled:
+            return
+        if rejected or self._chunk_timeouts >= 2:
+            self.chunking_disabled = True
+            self.throughput.pop("chunked", None)
+            self.metrics.increment(self.name, "chunk_fallbacks")
+            if self.log_notifications:
+                print("CHUNKING_DISABLED")
+
+    def _record_transfer(self, strategy: str, size: int, elapsed: float) -> None:
+        self.metrics.increment(self.name, f"{strategy}_bytes", size)
+        self.metrics.observe(self.name, f"transfer_{strategy}", elapsed)
+        if elapsed <= 0:
+            return
+        rate = size / elapsed
+        previous = self.throughput.get(strategy)
+        self.throughput[strategy] = rate if previous is None else previous + 0.25 * (rate - previous)
+
+    async def _deliver(self, frame: bytes, delay: float, barrier: Optional[CommitBarrier] = None) -> None:
+        needs_handshake = not (self.streaming and self.handshaken)
+        streamed = not needs_handshake
+        resends = 0
+        handshakes = 0
+        while True:
+            try:
+                if needs_handshake:
+                    with self.metrics.span(self.name, "handshake"):
+                        await self._handshake(delay)
+                    needs_handshake = False
+                await self._push_frame(frame, barrier)
+                break
+            except asyncio.TimeoutError:
+                if streamed:
+                    streamed = False
+                    needs_handshake = True
+                    self.handshaken = False
+                    self._count_recovery("stream_resyncs")
                     if self.log_notifications:
-                        print("HANDSHAKE_STAGE_TWO_SKIPPED")
-                else:
-                    await asyncio.sleep(delay)
-                if skip_stage_two:
-                    await asyncio.sleep(delay)
-                await self.client.write_gatt_char(UUID_WRITE, frame, response=True)
-                await wait_for_ack(self.watcher.stage_three, "FRAME_ACK", self.log_notifications)
-                await asyncio.sleep(delay)
-                # await self.client.write_gatt_char(UUID_WRITE, FRAME_VALIDATION, response=False)
+                        print("STREAM_RESYNC")
+                    continue
+                if not needs_handshake and resends < self.frame_retries:
+                    resends += 1
+                    self._count_recovery("recovery_resends")
+                    if self.log_notifications:
+                        print("FRAME_RESEND")
+                    continue
+                if handshakes >= self.handshake_retries:
+                    raise
+                handshakes += 1
+                resends = 0
+                needs_handshake = True
+                self.handshaken = False
+                self._count_recovery("recovery_handshakes")
+                if self.log_notifications:
+                    print("FRAME_REHANDSHAKE")
+        self.metrics.increment(self.name, "frames_sent")
+        if self.streaming:
+            self.handshaken = True
+            return
+        await self._settle("frame", delay)
+        # await self.transport.write(UUID_WRITE, FRAME_VALIDATION, response=False)
+
+    def _count_recovery(self, counter: str) -> None:
+        self.metrics.increment(self.name, counter)
+        self.metrics.increment(self.name, "retries")
+
+    def _check_breaker(self) -> int:
+        now = asyncio.get_running_loop().time()
+        state = self.breaker.state(now)
+        if state == "open":
+            self.metrics.increment(self.name, "breaker_rejections")
+            remaining = self.breaker.cooldown - (now - self.breaker.opened_at)
+            raise CircuitOpenError(f"Panel {self.name} is unavailable for another {remaining:.1f}s")
+        if state == "half_open":
+            return 0
+        return self.max_retries
+
+    async def send_frame(self, frame: bytes, delay: float = 0.2, barrier: Optional[CommitBarrier] = None) -> None:
+        try:
+            async with self._io_lock:
+                await self._send_locked(frame, delay, barrier)
+        finally:
+            if barrier is not None:
+                barrier.abandon(self.name)
+
+    async def _send_locked(self, frame: bytes, delay: float, barrier: Optional[CommitBarrier] = None) -> None:
+        retries = self._check_breaker()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self._ensure_connected(retries)
+                await self._deliver(frame, delay, barrier)
+                self.breaker.record_success()
                 return
-            except (asyncio.TimeoutError, BleakError, ConnectionError) as error:
-                if not self.auto_reconnect or attempt > self.max_retries:
-                    await self._safe_disconnect()
-                    raise error
-                await self._safe_disconnect()
-                await asyncio.sleep(self.reconnect_delay)
             except Exception as error:
-                if not self.auto_reconnect or attempt > self.max_retries:
+                if not self.auto_reconnect or attempt > retries:
                     await self._safe_disconnect()
+                    if self.breaker.record_failure(asyncio.get_running_loop().time()):
+                        self.metrics.increment(self.name, "breaker_trips")
                     raise error
+                self._count_recovery("recovery_reconnects")
                 await self._safe_disconnect()
-                await asyncio.sleep(self.reconnect_delay)
-
+                await asyncio.sleep(self._backoff(attempt))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import colorsys
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from PIL import Image, ImageChops
+
+RGB = tuple[int, int, int]
+EFFECTS = ("solid", "gradient", "rainbow", "hue", "pulse")
+
+
+def _scale(color: RGB, factor: float) -> RGB:
+    return tuple(max(0, min(255, int(round(channel * factor)))) for channel in color)
+
+
+def _rotate_hue(color: RGB, turns: float) -> RGB:
+    hue, saturation, value = colorsys.rgb_to_hsv(*(channel / 255.0 for channel in color))
+    red, green, blue = colorsys.hsv_to_rgb((hue + turns) % 1.0, saturation, value)
+    return (int(round(red * 255)), int(round(green * 255)), int(round(blue * 255)))
+
+
+@lru_cache(maxsize=32)
+def _gradient(width: int, height: int, start: RGB, end: RGB, mirrored: bool) -> Image.Image:
+    row = Image.new("RGB", (width, 1))
+    span = max(1, width - 1)
+    colors = []
+    for index in range(width):
+        level = index / span
+        if mirrored:
+            level = 1.0 - abs(2.0 * level - 1.0)
+        colors.append(tuple(int(round(a + (b - a) * level)) for a, b in zip(start, end)))
+    row.putdata(colors)
+    return row.resize((width, height), Image.Resampling.NEAREST)
+
+
+@lru_cache(maxsize=32)
+def _spectrum(width: int, height: int, base: RGB) -> Image.Image:
+    row = Image.new("RGB", (width, 1))
+    row.putdata([_rotate_hue(base, index / width) for index in range(width)])
+    return row.resize((width, height), Image.Resampling.NEAREST)
+
+
+def colorize(mask: Image.Image, fill: Image.Image | RGB) -> Image.Image:
+    if isinstance(fill, tuple):
+        fill = Image.new("RGBA", mask.size, (*fill, 255))
+    elif fill.mode != "RGBA":
+        fill = fill.convert("RGBA")
+    return Image.composite(fill, Image.new("RGBA", mask.size, (0, 0, 0, 0)), mask)
+
+
+@dataclass(frozen=True)
+class TextEffect:
+    name: str = "solid"
+    color: RGB = (255, 0, 0)
+    accent: RGB = (0, 0, 255)
+    period: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.name not in EFFECTS:
+            raise ValueError(f"Unknown text effect '{self.name}'")
+
+    @property
+    def dynamic(self) -> bool:
+        if self.name in ("hue", "pulse"):
+            return True
+        return self.name in ("gradient", "rainbow") and self.period > 0
+
+    def phase(self, elapsed: float) -> float:
+        if self.period <= 0:
+            return 0.0
+        return (elapsed / self.period) % 1.0
+
+    def fill(self, size: tuple[int, int], elapsed: float = 0.0) -> Image.Image | RGB:
+        width, height = size
+        phase = self.phase(elapsed)
+        if self.name == "hue":
+            return _rotate_hue(self.color, phase)
+        if self.name == "pulse":
+            return _scale(self.color, 0.2 + 0.8 * (0.5 + 0.5 * math.cos(2 * math.pi * phase)))
+        if self.name == "gradient":
+            base = _gradient(width, height, self.color, self.accent, self.period > 0)
+        elif self.name == "rainbow":
+            base = _spectrum(width, height, self.color)
+        else:
+            return self.color
+        shift = int(round(phase * width))
+        return ImageChops.offset(base, shift, 0) if shift else base
+
+    def render(self, mask: Image.Image, elapsed: float = 0.0) -> Image.Image:
+        return colorize(mask, self.fill(mask.size, elapsed))
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import asyncio
+import binascii
+import random
+from dataclasses import dataclass, field, replace
+from io import BytesIO
+from typing import Optional
+from bleak.exc import BleakError
+from PIL import Image
+from .display_session import (
+    ACK_STAGE_ONE,
+    ACK_STAGE_THREE,
+    ACK_STAGE_TWO,
+    HANDSHAKE_FIRST,
+    HANDSHAKE_SECOND,
+    UUID_NOTIFY,
+    UUID_WRITE,
+)
+from .transport import DisconnectHandler, NotificationHandler, Transport
+
+FRAME_HEADER_SIZE = 15
+
+
+@dataclass
+class LinkProfile:
+    latency: float = 0.005
+    jitter: float = 0.0
+    mtu: int = 247
+    bytes_per_second: float = 0.0
+    loss: float = 0.0
+    disconnect_rate: float = 0.0
+    connect_time: float = 0.05
+    require_handshake: bool = True
+    accepts_chunks: bool = True
+
+
+@dataclass
+class EmulatedPanel:
+    address: str
+    profile: LinkProfile
+    width: int = 32
+    height: int = 32
+    image: Optional[Image.Image] = None
+    frames_received: int = 0
+    handshakes: int = 0
+    crc_errors: int = 0
+    rejected_frames: int = 0
+    connections: int = 0
+    handshaken: bool = False
+    history: list[Image.Image] = field(default_factory=list)
+    keep_history: bool = False
+    _buffer: bytearray = field(default_factory=bytearray)
+    _expected: int = 0
+
+    def reset_link(self) -> None:
+        self.handshaken = False
+        self._buffer.clear()
+        self._expected = 0
+
+    def receive(self, data: bytes) -> list[bytes]:
+        if self._expected:
+            return self._accumulate(data)
+        if data == HANDSHAKE_FIRST:
+            self.handshaken = False
+            return [ACK_STAGE_ONE]
+        if data == HANDSHAKE_SECOND:
+            self.handshaken = True
+            self.handshakes += 1
+            return [ACK_STAGE_TWO]
+        if len(data) >= 3 and data[2] == 0x02:
+            self._expected = int.from_bytes(data[0:2], "little")
+            return self._accumulate(data)
+        return []
+
+    def _accumulate(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        if len(self._buffer) < self._expected:
+            return []
+        frame = bytes(self._buffer[: self._expected])
+        self._buffer.clear()
+        self._expected = 0
+        return self._accept_frame(frame)
+
+    def _accept_frame(self, frame: bytes) -> list[bytes]:
+        if self.profile.require_handshake and not self.handshaken:
+            self.rejected_frames += 1
+            return []
+        data_length = int.from_bytes(frame[5:7], "little")
+        checksum = int.from_bytes(frame[9:13], "little")
+        png_bytes = frame[FRAME_HEADER_SIZE : FRAME_HEADER_SIZE + data_length]
+        if len(png_bytes) != data_length or binascii.crc32(png_bytes) != checksum:
+            self.crc_errors += 1
+            return []
+        image = Image.open(BytesIO(png_bytes))
+        image.load()
+        self.image = image.convert("RGB")
+        if self.keep_history:
+            self.history.append(self.image)
+        self.frames_received += 1
+        return [ACK_STAGE_THREE]
+
+
+class EmulatedTransport(Transport):
+    def __init__(
+        self,
+        emulator: "BleEmulator",
+        address: str,
+        on_disconnect: Optional[DisconnectHandler] = None,
+        adapter: Optional[str] = None,
+    ) -> None:
+        self.emulator = emulator
+        self.address = address
+        self.on_disconnect = on_disconnect
+        self.adapter = adapter or "default"
+        self.panel: Optional[EmulatedPanel] = None
+        self.handler: Optional[NotificationHandler] = None
+        self.bytes_written = 0
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def mtu_size(self) -> int:
+        if self.panel is None:
+            return 23
+        return self.panel.profile.mtu
+
+    async def connect(self) -> None:
+        panel = self.emulator.panels.get(self.address.upper())
+        if panel is None:
+            await asyncio.sleep(self.emulator.scan_time)
+            raise BleakError(f"Device with address {self.address} was not found")
+        emulator = self.emulator
+        if emulator.max_connecting and emulator.connecting.get(self.adapter, 0) >= emulator.max_connecting:
+            await asyncio.sleep(panel.profile.connect_time)
+            raise BleakError(f"Adapter {self.adapter}: operation already in progress")
+        if emulator.max_links and emulator.links(self.adapter) >= emulator.max_links:
+            await asyncio.sleep(panel.profile.connect_time)
+            raise BleakError(f"Adapter {self.adapter}: connection limit of {emulator.max_links} reached")
+        emulator.connecting[self.adapter] = emulator.connecting.get(self.adapter, 0) + 1
+        try:
+            await asyncio.sleep(panel.profile.connect_time)
+        finally:
+            emulator.connecting[self.adapter] -= 1
+        panel.reset_link()
+        panel.connections += 1
+        self.panel = panel
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        self._drop()
+
+    async def start_notify(self, uuid: str, handler: NotificationHandler) -> None:
+        self._require_link()
+        if uuid != UUID_NOTIFY:
+            raise BleakError(f"Characteristic {uuid} does not support notifications")
+        self.handler = handler
+
+    async def stop_notify(self, uuid: str) -> None:
+        self.handler = None
+
+    async def write(self, uuid: str, data: bytes, response: bool) -> None:
+        panel = self._require_link()
+        if uuid != UUID_WRITE:
+            raise BleakError(f"Characteristic {uuid} is not writable")
+        profile = panel.profile
+        if not response and len(data) > profile.mtu - 3:
+            raise BleakError(f"Write without response of {len(data)} bytes exceeds MTU {profile.mtu}")
+        if not response and not profile.accepts_chunks and data not in (HANDSHAKE_FIRST, HANDSHAKE_SECOND):
+            raise BleakError("Write without response is not permitted for frame data")
+        if profile.bytes_per_second > 0:
+            async with self.emulator.airtime(self.adapter):
+                await asyncio.sleep(len(data) / profile.bytes_per_second)
+        if response:
+            await asyncio.sleep(self._latency(profile))
+        else:
+            await asyncio.sleep(0)
+        if not self._connected:
+            raise BleakError("Not connected")
+        if profile.disconnect_rate and self.emulator.random.random() < profile.disconnect_rate:
+            self._drop()
+            raise BleakError("Link lost")
+        self.bytes_written += len(data)
+        for notification in panel.receive(bytes(data)):
+            self._notify(profile, notification)
+
+    def _notify(self, profile: LinkProfile, payload: bytes) -> None:
+        if profile.loss and self.emulator.random.random() < profile.loss:
+            return
+        loop = asyncio.get_running_loop()
+        loop.call_later(self._latency(profile), self._deliver, payload)
+
+    def _deliver(self, payload: bytes) -> None:
+        if self._connected and self.handler is not None:
+            self.handler(0, bytearray(payload))
+
+    def _latency(self, profile: LinkProfile) -> float:
+        if not profile.jitter:
+            return profile.latency
+        return max(0.0, profile.latency + self.emulator.random.uniform(-profile.jitter, profile.jitter))
+
+    def _require_link(self) -> EmulatedPanel:
+        if not self._connected or self.panel is None:
+            raise BleakError("Not connected")
+        return self.panel
+
+    def _drop(self) -> None:
+        if self.panel is not None:
+            self.panel.reset_link()
+        was_connected = self._connected
+        self._connected = False
+        self.handler = None
+        if was_connected and self.on_disconnect is not None:
+            self.on_disconnect(self)
+
+
+class BleEmulator:
+    def __init__(
+        self,
+        profile: Optional[LinkProfile] = None,
+        seed: Optional[int] = None,
+        scan_time: float = 0.1,
+        max_links: int = 0,
+        max_connecting: int = 0,
+    ) -> None:
+        self.profile = profile or LinkProfile()
+        self.random = random.Random(seed)
+        self.scan_time = scan_time
+        self.max_links = max_links
+        self.max_connecting = max_connecting
+        self.connecting: dict[str, int] = {}
+        self.radios: dict[str, asyncio.Lock] = {}
+        self.panels: dict[str, EmulatedPanel] = {}
+        self.transports: list[EmulatedTransport] = []
+
+    def add_panel(
+        self,
+        address: str,
+        width: int = 32,
+        height: int = 32,
+        profile: Optional[LinkProfile] = None,
+    ) -> EmulatedPanel:
+        panel = EmulatedPanel(address.upper(), replace(profile or self.profile), width, height)
+        self.panels[panel.address] = panel
+        return panel
+
+    def transport_factory(
+        self,
+        address: str,
+        on_disconnect: Optional[DisconnectHandler] = None,
+        adapter: Optional[str] = None,
+        **_options: object,
+    ) -> EmulatedTransport:
+        transport = EmulatedTransport(self, address, on_disconnect, adapter)
+        self.transports.append(transport)
+        return transport
+
+    def airtime(self, adapter: str) -> asyncio.Lock:
+        if adapter not in self.radios:
+            self.radios[adapter] = asyncio.Lock()
+        return self.radios[adapter]
+
+    def links(self, adapter: str) -> int:
+        return sum(1 for transport in self.transports if transport.adapter == adapter and transport.is_connected)
+
+    def drop_link(self, address: str) -> None:
+        for transport in self.transports:
+            if transport.address.upper() == address.upper() and transport.is_connected:
+                transport._drop()
+
+    def displayed(self, address: str) -> Optional[Image.Image]:
+        panel = self.panels.get(address.upper())
+        return panel.image if panel else None
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+from PIL import Image
+
+Colors = Optional[list[tuple[int, tuple[int, int, int]]]]
+
+
+@dataclass(frozen=True)
+class PngStrategy:
+    name: str
+    palette: bool = False
+    compress_level: int = -1
+    compress_type: int = -1
+
+
+STRATEGIES: dict[str, PngStrategy] = {
+    "rgb": PngStrategy("rgb"),
+    "rgb_fast": PngStrategy("rgb_fast", compress_level=1),
+    "rgb_filtered": PngStrategy("rgb_filtered", compress_level=9, compress_type=1),
+    "palette": PngStrategy("palette", palette=True, compress_level=9),
+    "palette_rle": PngStrategy("palette_rle", palette=True, compress_level=9, compress_type=3),
+}
+
+
+def content_kind(colors: Colors) -> str:
+    if colors is None:
+        return "truecolor"
+    if len(colors) <= 2:
+        return "mono"
+    if len(colors) <= 16:
+        return "few"
+    return "indexed"
+
+
+def to_palette(image: Image.Image, colors: Colors) -> Optional[Image.Image]:
+    if colors is None:
+        return None
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for _, color in colors for channel in color])
+    return image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+class PngEncoder:
+    def __init__(
+        self,
+        strategy: str = "rgb",
+        candidates: Optional[list[str]] = None,
+        reprobe_interval: int = 256,
+    ) -> None:
+        if strategy != "auto" and strategy not in STRATEGIES:
+            raise ValueError(f"Unknown PNG strategy '{strategy}'")
+        self.strategy = strategy
+        self.candidates = list(candidates or STRATEGIES)
+        for name in self.candidates:
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown PNG strategy '{name}'")
+        self.reprobe_interval = reprobe_interval
+        self.chosen: dict[str, str] = {}
+        self.ratios: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.frames = 0
+        self.probes = 0
+        self.bytes_out = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def encode(self, image: Image.Image) -> bytes:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        colors = image.getcolors(256)
+        kind = content_kind(colors)
+        with self._lock:
+            count = self.counts.get(kind, 0)
+            self.counts[kind] = count + 1
+            reprobe = self.strategy == "auto" and self.reprobe_interval > 0 and count % self.reprobe_interval == 0
+            chosen = None if reprobe else self.chosen.get(kind)
+            ratio = self.ratios.get(kind, 1.0)
+        if chosen is None:
+            return self._probe(image, colors, kind)
+        data = self._encode(image, STRATEGIES[chosen], colors)
+        with self._lock:
+            self.frames += 1
+            self.bytes_out += len(data)
+            self.bytes_saved += int(len(data) * (ratio - 1.0))
+        return data
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "frames": self.frames,
+                "probes": self.probes,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_saved,
+                "chosen": dict(self.chosen),
+            }
+
+    def _probe(self, image: Image.Image, colors: Colors, kind: str) -> bytes:
+        names = self.candidates if self.strategy == "auto" else [self.strategy]
+        results = {name: self._encode(image, STRATEGIES[name], colors) for name in dict.fromkeys([*names, "rgb"])}
+        best = min(names, key=lambda name: len(results[name]))
+        data = results[best]
+        baseline = len(results["rgb"])
+        with self._lock:
+            self.chosen[kind] = best
+            self.ratios[kind] = baseline / max(1, len(data))
+            self.frames += 1
+            self.probes += 1
+            self.bytes_out += len(data)
+            self.bytes_saved += baseline - len(data)
+        return data
+
+    @staticmethod
+    def _encode(image: Image.Image, strategy: PngStrategy, colors: Colors) -> bytes:
+        source = image
+        if strategy.palette:
+            source = to_palette(image, colors) or image
+        buffer = BytesIO()
+        source.save(
+            buffer,
+            format="PNG",
+            optimize=False,
+            compress_level=strategy.compress_level,
+            compress_type=strategy.compress_type,
+        )
+        return buffer.getvalue()
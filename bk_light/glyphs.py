@@ -0,0 +1,150 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from PIL import Image, ImageDraw, ImageFont
+
+FontKey = tuple[Optional[str], int, bool]
+
+
+def load_font(path: Optional[Path], size: int) -> ImageFont.ImageFont:
+    if path is None:
+        return ImageFont.load_default()
+    try:
+        return ImageFont.truetype(str(path), size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@dataclass(frozen=True)
+class Glyph:
+    mask: Image.Image
+    bbox: tuple[int, int, int, int]
+    advance: float
+
+
+@dataclass
+class FontFace:
+    key: FontKey
+    font: ImageFont.ImageFont
+    ascent: int = 0
+    descent: int = 0
+    line_height: int = 0
+    digit_advance: float = 0.0
+    digits: frozenset[str] = field(default_factory=frozenset)
+
+    @property
+    def mask_mode(self) -> str:
+        return "L" if self.key[2] else "1"
+
+
+class GlyphAtlas:
+    def __init__(self, max_fonts: int = 8, max_glyphs: int = 4096) -> None:
+        self.max_fonts = max_fonts
+        self.max_glyphs = max_glyphs
+        self.fonts: OrderedDict[FontKey, FontFace] = OrderedDict()
+        self.glyphs: OrderedDict[tuple[FontKey, str], Optional[Glyph]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.font_loads = 0
+        self._lock = threading.Lock()
+
+    def face(self, path: Optional[Path], size: int, antialias: bool) -> FontFace:
+        key = (str(path) if path is not None else None, size, antialias)
+        with self._lock:
+            face = self.fonts.get(key)
+            if face is not None:
+                self.fonts.move_to_end(key)
+                return face
+        face = self._load_face(key, path, size)
+        with self._lock:
+            self.fonts[key] = face
+            while len(self.fonts) > self.max_fonts:
+                evicted, _ = self.fonts.popitem(last=False)
+                for glyph_key in [item for item in self.glyphs if item[0] == evicted]:
+                    del self.glyphs[glyph_key]
+                self.evictions += 1
+            self.font_loads += 1
+        return face
+
+    def glyph(self, face: FontFace, char: str) -> Optional[Glyph]:
+        key = (face.key, char)
+        with self._lock:
+            if key in self.glyphs:
+                self.glyphs.move_to_end(key)
+                self.hits += 1
+                return self.glyphs[key]
+            self.misses += 1
+        glyph = self._rasterize(face, char)
+        with self._lock:
+            self.glyphs[key] = glyph
+            while len(self.glyphs) > self.max_glyphs:
+                self.glyphs.popitem(last=False)
+                self.evictions += 1
+        return glyph
+
+    def clear(self) -> None:
+        with self._lock:
+            self.fonts.clear()
+            self.glyphs.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "fonts": len(self.fonts),
+                "glyphs": len(self.glyphs),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "font_loads": self.font_loads,
+            }
+
+    @staticmethod
+    def _advance(font: ImageFont.ImageFont, draw: ImageDraw.ImageDraw, char: str) -> float:
+        if hasattr(font, "getlength"):
+            value = font.getlength(char)
+            if value > 0:
+                return value
+        width = draw.textlength(char, font=font)
+        return float(width if width > 0 else 1)
+
+    def _load_face(self, key: FontKey, path: Optional[Path], size: int) -> FontFace:
+        font = load_font(path, size)
+        face = FontFace(key, font)
+        draw = ImageDraw.Draw(Image.new(face.mask_mode, (1, 1), 0))
+        digits = []
+        for digit in "0123456789":
+            bbox = draw.textbbox((0, 0), digit, font=font)
+            if bbox is None:
+                continue
+            digits.append(digit)
+            face.digit_advance = max(face.digit_advance, self._advance(font, draw, digit))
+        face.digits = frozenset(digits)
+        if hasattr(font, "getmetrics"):
+            face.ascent, face.descent = font.getmetrics()
+        if face.ascent == 0 and face.descent == 0:
+            sample_bbox = draw.textbbox((0, 0), "0", font=font)
+            if sample_bbox:
+                face.ascent = max(face.ascent, -sample_bbox[1])
+                face.descent = max(face.descent, sample_bbox[3])
+        face.line_height = face.ascent + face.descent if face.ascent + face.descent > 0 else size
+        return face
+
+    def _rasterize(self, face: FontFace, char: str) -> Optional[Glyph]:
+        draw = ImageDraw.Draw(Image.new(face.mask_mode, (1, 1), 0))
+        bbox = draw.textbbox((0, 0), char, font=face.font)
+        if bbox is None:
+            return None
+        width = max(1, bbox[2] - bbox[0])
+        height = max(1, bbox[3] - bbox[1])
+        mask = Image.new(face.mask_mode, (width, height), 0)
+        ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), char, fill=255, font=face.font)
+        if mask.mode != "L":
+            mask = mask.convert("L")
+        return Glyph(mask, bbox, self._advance(face.font, draw, char))
+
+
+DEFAULT_ATLAS = GlyphAtlas()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from PIL import Image
+from .config import PanelDescriptor, PanelsConfig
+
+TRANSPOSES = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+RESAMPLING = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "hamming": Image.Resampling.HAMMING,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+def orient(image: Image.Image, rotation: int) -> Image.Image:
+    rotation %= 360
+    if not rotation:
+        return image
+    if rotation == 180 or (rotation in TRANSPOSES and image.width == image.height):
+        return image.transpose(TRANSPOSES[rotation])
+    return image.rotate(rotation, expand=False)
+
+
+@dataclass(frozen=True)
+class TilePlan:
+    descriptor: PanelDescriptor
+    box: tuple[int, int, int, int]
+    rotation: int = 0
+
+    def extract(self, canvas: Image.Image) -> Image.Image:
+        return orient(canvas.crop(self.box), self.rotation)
+
+
+@dataclass
+class LayoutPlan:
+    canvas_size: tuple[int, int]
+    tiles: dict[str, TilePlan]
+    gaps: list[tuple[int, int]] = field(default_factory=list)
+    resample: Image.Resampling = Image.Resampling.BICUBIC
+
+    def fit(self, image: Image.Image) -> Image.Image:
+        if image.size == self.canvas_size:
+            return image
+        return image.resize(self.canvas_size, self.resample)
+
+    def tile_for(self, descriptor: PanelDescriptor) -> TilePlan:
+        return self.tiles[descriptor.address.upper()]
+
+
+def compile_layout(panels: PanelsConfig, default_rotation: int = 0, resample: str = "bicubic") -> LayoutPlan:
+    if resample not in RESAMPLING:
+        raise ValueError(f"Unknown resampling filter '{resample}'")
+    if panels.columns < 1 or panels.rows < 1:
+        raise ValueError(f"Panel layout must have at least one column and row, got {panels.columns}x{panels.rows}")
+    tiles: dict[str, TilePlan] = {}
+    cells: dict[tuple[int, int], str] = {}
+    for descriptor in panels.items:
+        cell = (descriptor.grid_x, descriptor.grid_y)
+        if not (0 <= descriptor.grid_x < panels.columns and 0 <= descriptor.grid_y < panels.rows):
+            raise ValueError(
+                f"Panel '{descriptor.name}' at grid {cell} is outside the {panels.columns}x{panels.rows} layout"
+            )
+        if cell in cells:
+            raise ValueError(f"Panels '{cells[cell]}' and '{descriptor.name}' both occupy grid {cell}")
+        address = descriptor.address.upper()
+        if address in tiles:
+            raise ValueError(f"Panel address {descriptor.address} is listed more than once")
+        cells[cell] = descriptor.name
+        left = descriptor.grid_x * panels.tile_width
+        top = descriptor.grid_y * panels.tile_height
+        rotation = descriptor.rotation if descriptor.rotation is not None else default_rotation
+        tiles[address] = TilePlan(
+            descriptor,
+            (left, top, left + panels.tile_width, top + panels.tile_height),
+            rotation % 360,
+        )
+    gaps = [
+        (column, row)
+        for row in range(panels.rows)
+        for column in range(panels.columns)
+        if (column, row) not in cells
+    ]
+    return LayoutPlan(
+        (panels.columns * panels.tile_width, panels.rows * panels.tile_height),
+        tiles,
+        gaps,
+        RESAMPLING[resample],
+    )
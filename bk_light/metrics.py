@@ -0,0 +1,171 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ContextManager, Optional, Protocol
+
+_NULL_SPAN = nullcontext()
+
+
+class Exporter(Protocol):
+    def record(self, event: dict[str, object]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class Metrics:
+    def span(self, panel: str, stage: str) -> ContextManager[None]:
+        return _NULL_SPAN
+
+    def observe(self, panel: str, stage: str, seconds: float) -> None:
+        return None
+
+    def increment(self, panel: str, counter: str, amount: float = 1) -> None:
+        return None
+
+    def flush(self, force: bool = False) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+@dataclass
+class SpanStats:
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+
+class _Span:
+    __slots__ = ("metrics", "panel", "stage", "started")
+
+    def __init__(self, metrics: "MetricsRecorder", panel: str, stage: str) -> None:
+        self.metrics = metrics
+        self.panel = panel
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics.observe(self.panel, self.stage, time.perf_counter() - self.started)
+
+
+class MetricsRecorder(Metrics):
+    def __init__(
+        self,
+        exporters: Optional[list[Exporter]] = None,
+        prometheus_path: Optional[Path] = None,
+        prometheus_interval: float = 10.0,
+    ) -> None:
+        self.exporters = list(exporters or [])
+        self.prometheus_path = prometheus_path
+        self.prometheus_interval = prometheus_interval
+        self.spans: dict[tuple[str, str], SpanStats] = {}
+        self.counters: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def span(self, panel: str, stage: str) -> ContextManager[None]:
+        return _Span(self, panel, stage)
+
+    def observe(self, panel: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.spans.setdefault((panel, stage), SpanStats())
+            stats.count += 1
+            stats.total += seconds
+            stats.maximum = max(stats.maximum, seconds)
+        self._export({"type": "span", "panel": panel, "stage": stage, "seconds": seconds})
+
+    def increment(self, panel: str, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            key = (panel, counter)
+            self.counters[key] = self.counters.get(key, 0) + amount
+        self._export({"type": "counter", "panel": panel, "counter": counter, "amount": amount})
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        result: dict[str, dict[str, dict[str, float]]] = {}
+        with self._lock:
+            for (panel, stage), stats in self.spans.items():
+                entry = result.setdefault(panel, {}).setdefault("spans", {})
+                entry[stage] = {"count": stats.count, "total": stats.total, "max": stats.maximum}
+            for (panel, counter), value in self.counters.items():
+                result.setdefault(panel, {}).setdefault("counters", {})[counter] = value
+        return result
+
+    def flush(self, force: bool = False) -> None:
+        if self.prometheus_path is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.prometheus_interval:
+            return
+        self._last_flush = now
+        write_prometheus(self, self.prometheus_path)
+
+    def close(self) -> None:
+        self.flush(force=True)
+        for exporter in self.exporters:
+            exporter.close()
+
+    def _export(self, event: dict[str, object]) -> None:
+        if not self.exporters:
+            return
+        event["ts"] = time.time()
+        for exporter in self.exporters:
+            exporter.record(event)
+
+
+class JsonLinesExporter:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._handle = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, event: dict[str, object]) -> None:
+        line = json.dumps(event, separators=(",", ":"))
+        with self._lock:
+            self._handle.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus(recorder: MetricsRecorder, path: Path) -> None:
+    path = Path(path)
+    lines = [
+        "# HELP bk_light_stage_seconds Time spent per send stage.",
+        "# TYPE bk_light_stage_seconds summary",
+    ]
+    with recorder._lock:
+        spans = sorted(recorder.spans.items())
+        counters = sorted(recorder.counters.items(), key=lambda item: (item[0][1], item[0][0]))
+    for (panel, stage), stats in spans:
+        labels = f'panel="{_label(panel)}",stage="{_label(stage)}"'
+        lines.append(f"bk_light_stage_seconds_sum{{{labels}}} {stats.total:.6f}")
+        lines.append(f"bk_light_stage_seconds_count{{{labels}}} {stats.count}")
+    lines.append("# HELP bk_light_stage_seconds_max Slowest observation per send stage.")
+    lines.append("# TYPE bk_light_stage_seconds_max gauge")
+    for (panel, stage), stats in spans:
+        labels = f'panel="{_label(panel)}",stage="{_label(stage)}"'
+        lines.append(f"bk_light_stage_seconds_max{{{labels}}} {stats.maximum:.6f}")
+    declared: set[str] = set()
+    for (panel, counter), value in counters:
+        metric = f"bk_light_{counter}_total"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f'{metric}{{panel="{_label(panel)}"}} {value:g}')
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(temporary, path)
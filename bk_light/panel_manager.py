@@ -1,52 +1,135 @@
 from __future__ import annotations
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from io import BytesIO
+from functools import partial
+from pathlib import Path
 from typing import List, Optional
 from PIL import Image
+from .adapters import AdapterPool
 from .config import AppConfig, PanelDescriptor
-from .display_session import BleDisplaySession
+from .display_session import BleDisplaySession, CommitBarrier, backoff_delay, frame_checksum
+from .encoder import PngEncoder
+from .frame_cache import FrameCache
+from .layout import LayoutPlan, TilePlan, compile_layout
+from .metrics import JsonLinesExporter, Metrics, MetricsRecorder
+from .transport import TransportFactory
 
 
 @dataclass
 class PanelSession:
     descriptor: Optional[PanelDescriptor]
     session: BleDisplaySession
+    last_checksum: Optional[int] = None
+    last_connection: int = 0
+    last_sent_at: float = 0.0
+    error: Optional[BaseException] = None
+    failures: int = 0
+
+
+def build_metrics(config: AppConfig) -> Metrics:
+    display = config.display
+    exporters = []
+    if display.metrics_jsonl:
+        exporters.append(JsonLinesExporter(Path(display.metrics_jsonl)))
+    prometheus = Path(display.metrics_prometheus) if display.metrics_prometheus else None
+    if exporters or prometheus:
+        return MetricsRecorder(exporters, prometheus, display.metrics_interval)
+    return Metrics()
 
 
 class PanelManager:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        transport_factory: Optional[TransportFactory] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         self.config = config
+        self.transport_factory = transport_factory
+        self._owns_metrics = metrics is None
+        self.metrics = metrics if metrics is not None else build_metrics(config)
         self.sessions: List[PanelSession] = []
         self.multi_panel = bool(config.panels.items)
+        device = config.device
+        self.adapters = AdapterPool(
+            device.adapters,
+            device.max_connecting,
+            device.connect_stagger,
+            device.cache_ttl,
+            config.display.write_window,
+        )
+        if self.multi_panel:
+            self.adapters.assign(config.panels.items)
+        elif device.address:
+            self.adapters.assign([PanelDescriptor("panel", device.address)])
         self.tile_width = config.panels.tile_width
         self.tile_height = config.panels.tile_height
         self.columns = config.panels.columns if self.multi_panel else 1
         self.rows = config.panels.rows if self.multi_panel else 1
+        self.layout: Optional[LayoutPlan] = (
+            compile_layout(config.panels, config.device.rotate, config.panels.resample) if self.multi_panel else None
+        )
+        self.encoder = PngEncoder(config.display.png_strategy)
+        cache_bytes = config.display.frame_cache_bytes
+        self.frame_cache: Optional[FrameCache] = FrameCache(cache_bytes) if cache_bytes > 0 else None
+        self._submitted: List[asyncio.Future] = []
+        self._attaching: dict[str, asyncio.Task] = {}
+        self._canvas: Optional[Image.Image] = None
+        self.last_skew: Optional[float] = None
+        workers = config.display.prepare_workers
+        self.executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bk-light-prepare") if workers > 0 else None
+        )
 
     @property
     def canvas_size(self) -> tuple[int, int]:
         return (self.columns * self.tile_width, self.rows * self.tile_height)
 
     async def __aenter__(self) -> "PanelManager":
-        if self.multi_panel:
-            await self._connect_panels()
-        else:
-            await self._connect_single()
+        try:
+            if self.transport_factory is None:
+                await self._discover()
+            if self.multi_panel:
+                await self._connect_panels()
+            else:
+                await self._connect_single()
+        except BaseException as error:
+            await self.__aexit__(type(error), error, error.__traceback__)
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
+        for task in self._attaching.values():
+            task.cancel()
+        await asyncio.gather(*self._attaching.values(), return_exceptions=True)
+        self._attaching.clear()
+        try:
+            self._collect_submitted()
+        except Exception:
+            pass
         while self.sessions:
             descriptor_session = self.sessions.pop()
             try:
                 await descriptor_session.session.__aexit__(exc_type, exc, tb)
             except Exception:
                 pass
+        await self.adapters.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_metrics:
+            self.metrics.close()
+        else:
+            self.metrics.flush(force=True)
+
+    async def _discover(self) -> None:
+        await self.adapters.discover(self.config.device.scan_timeout, self.config.device.background_scan)
 
     async def _connect_single(self) -> None:
         address = self.config.device.address
         if not address:
             raise ValueError("No panel configured. Set device.address or define panels list in config.yaml.")
+        adapter = self.adapters.adapter_for(address)
         session = BleDisplaySession(
             address=address,
             auto_reconnect=self.config.device.auto_reconnect,
@@ -57,57 +140,298 @@ class PanelManager:
             log_notifications=self.config.display.log_notifications,
             max_retries=self.config.display.max_retries,
             scan_timeout=self.config.device.scan_timeout,
+            streaming=self.config.display.streaming,
+            adaptive_pacing=self.config.display.adaptive_pacing,
+            queue_depth=self.config.display.queue_depth,
+            gamma=self.config.device.gamma,
+            white_balance=self.config.device.white_balance,
+            encoder=self.encoder,
+            frame_cache=self.frame_cache,
+            transport_factory=self.transport_factory,
+            metrics=self.metrics,
+            registry=self.adapters.registry_for(adapter),
+            adapter=adapter,
+            connect_slot=partial(self.adapters.connecting, adapter),
+            frame_retries=self.config.display.frame_retries,
+            handshake_retries=self.config.display.handshake_retries,
+            ack_timeout=self.config.display.ack_timeout,
+            reconnect_backoff_max=self.config.device.reconnect_backoff_max,
+            breaker_threshold=self.config.device.breaker_threshold,
+            breaker_cooldown=self.config.device.breaker_cooldown,
+            keepalive=self.config.device.keepalive,
+            keepalive_interval=self.config.device.keepalive_interval,
+            write_strategy=self.config.display.write_strategy,
+            chunk_window=self.config.display.chunk_window,
+            chunk_pause=self.config.display.chunk_pause,
         )
         await session.__aenter__()
         self.sessions.append(PanelSession(None, session))
 
     async def _connect_panels(self) -> None:
-        tasks = []
+        pending = []
         for descriptor in self.config.panels.items:
-            rotation = descriptor.rotation if descriptor.rotation is not None else self.config.device.rotate
+            adapter = self.adapters.adapter_for(descriptor.address)
             brightness = descriptor.brightness if descriptor.brightness is not None else self.config.device.brightness
+            gamma = descriptor.gamma if descriptor.gamma is not None else self.config.device.gamma
+            white_balance = (
+                descriptor.white_balance if descriptor.white_balance is not None else self.config.device.white_balance
+            )
             session = BleDisplaySession(
                 address=descriptor.address,
                 auto_reconnect=self.config.device.auto_reconnect,
                 reconnect_delay=self.config.device.reconnect_delay,
-                rotation=rotation,
+                rotation=0,
                 brightness=brightness,
                 mtu=self.config.device.mtu,
                 log_notifications=self.config.display.log_notifications,
                 max_retries=self.config.display.max_retries,
                 scan_timeout=self.config.device.scan_timeout,
+                streaming=self.config.display.streaming,
+                adaptive_pacing=self.config.display.adaptive_pacing,
+                queue_depth=self.config.display.queue_depth,
+                gamma=gamma,
+                white_balance=white_balance,
+                encoder=self.encoder,
+                frame_cache=self.frame_cache,
+                transport_factory=self.transport_factory,
+                metrics=self.metrics,
+                registry=self.adapters.registry_for(adapter),
+                adapter=adapter,
+                connect_slot=partial(self.adapters.connecting, adapter),
+                frame_retries=self.config.display.frame_retries,
+                handshake_retries=self.config.display.handshake_retries,
+                ack_timeout=self.config.display.ack_timeout,
+                reconnect_backoff_max=self.config.device.reconnect_backoff_max,
+                breaker_threshold=self.config.device.breaker_threshold,
+                breaker_cooldown=self.config.device.breaker_cooldown,
+                keepalive=self.config.device.keepalive,
+                keepalive_interval=self.config.device.keepalive_interval,
+                write_strategy=self.config.display.write_strategy,
+                chunk_window=self.config.display.chunk_window,
+                chunk_pause=self.config.display.chunk_pause,
+                scheduler=self.adapters.scheduler_for(adapter) if self.config.display.write_scheduling else None,
+                priority=descriptor.priority,
+                name=descriptor.name,
+            )
+            pending.append((descriptor, session))
+        results = await asyncio.gather(
+            *(session.__aenter__() for _descriptor, session in pending), return_exceptions=True
+        )
+        failed = []
+        for (descriptor, session), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                failed.append((descriptor, session, result))
+            else:
+                self.sessions.append(PanelSession(descriptor, session))
+        required = self.config.display.min_panels
+        required = len(pending) if required is None else max(1, min(required, len(pending)))
+        if len(self.sessions) < required:
+            raise failed[0][2]
+        for descriptor, session, error in failed:
+            self._report_failure(descriptor.name, error)
+            self._attaching[descriptor.name] = asyncio.get_running_loop().create_task(
+                self._attach_panel(descriptor, session)
             )
-            tasks.append(self._connect_panel(descriptor, session))
-        await asyncio.gather(*tasks)
 
-    async def _connect_panel(self, descriptor: PanelDescriptor, session: BleDisplaySession) -> None:
-        await session.__aenter__()
-        self.sessions.append(PanelSession(descriptor, session))
+    async def _attach_panel(self, descriptor: PanelDescriptor, session: BleDisplaySession) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(
+                backoff_delay(
+                    self.config.device.reconnect_delay, attempt, self.config.device.reconnect_backoff_max
+                )
+            )
+            try:
+                await session.__aenter__()
+            except Exception as error:
+                self._report_failure(descriptor.name, error)
+                continue
+            break
+        panel_session = PanelSession(descriptor, session)
+        self.sessions.append(panel_session)
+        self._attaching.pop(descriptor.name, None)
+        self.metrics.increment(descriptor.name, "panels_attached")
+        if self._canvas is not None:
+            frame = self._build_tile(panel_session, self.layout.tile_for(descriptor), self._canvas)
+            self._submit_tile(panel_session, frame, 0.2, self.config.display.frame_deadline)
+
+    def _report_failure(self, name: str, error: BaseException) -> None:
+        self.metrics.increment(name, "panel_failures")
+        if self.config.display.log_notifications:
+            print(f"PANEL_FAILED {name}: {error!r}")
 
     async def send_image(self, image: Image.Image, delay: float = 0.2) -> None:
-        if self.multi_panel:
-            await self._send_multi(image, delay)
-        else:
-            buffer = BytesIO()
-            image.save(buffer, format="PNG", optimize=False)
-            await self.sessions[0].session.send_png(buffer.getvalue(), delay)
-
-    async def _send_multi(self, image: Image.Image, delay: float) -> None:
-        expected_width, expected_height = self.canvas_size
-        if image.size != (expected_width, expected_height):
-            image = image.resize((expected_width, expected_height))
-        tasks = []
+        changed = self._changed(await self._prepare(image))
+        barrier = self._barrier(len(changed))
+        results = await asyncio.gather(
+            *(self._send_tile(panel_session, frame, delay, barrier) for panel_session, frame in changed),
+            return_exceptions=True,
+        )
+        self.metrics.flush()
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and len(errors) == len(results) and not self._attaching:
+            raise errors[0]
+
+    async def submit_image(self, image: Image.Image, delay: float = 0.2) -> None:
+        self._collect_submitted()
+        deadline = self.config.display.frame_deadline
+        changed = self._changed(await self._prepare(image))
+        barrier = self._barrier(len(changed))
+        for panel_session, frame in changed:
+            self._submit_tile(panel_session, frame, delay, deadline, barrier)
+        self.metrics.flush()
+
+    def _changed(self, frames: List[tuple[PanelSession, bytes]]) -> List[tuple[PanelSession, bytes]]:
+        changed = []
+        for panel_session, frame in frames:
+            if self._unchanged(panel_session, frame):
+                self.metrics.increment(panel_session.session.name, "frames_skipped")
+            else:
+                changed.append((panel_session, frame))
+        return changed
+
+    def _barrier(self, parties: int) -> Optional[CommitBarrier]:
+        if not self.config.display.sync_commit or parties < 2:
+            return None
+        return CommitBarrier(parties, self.config.display.sync_timeout, self._on_committed)
+
+    def _on_committed(self, barrier: CommitBarrier) -> None:
+        self.last_skew = barrier.skew
+        self.metrics.observe("wall", "commit_skew", barrier.skew)
+        missed = barrier.missed
+        if missed:
+            self.metrics.increment("wall", "barrier_misses", len(missed))
+        if barrier.timed_out:
+            self.metrics.increment("wall", "barrier_timeouts")
+        if self.config.display.log_notifications:
+            print(f"COMMIT skew={barrier.skew * 1000:.1f}ms missed={sorted(missed)}")
+
+    def _submit_tile(
+        self,
+        panel_session: PanelSession,
+        frame: bytes,
+        delay: float,
+        deadline: Optional[float],
+        barrier: Optional[CommitBarrier] = None,
+    ) -> None:
+        panel_session.last_checksum = None
+        future = panel_session.session.submit_frame(frame, delay, deadline, barrier)
+        future.add_done_callback(partial(self._on_submitted, panel_session, frame))
+        self._submitted.append(future)
+
+    async def _prepare(self, image: Image.Image) -> List[tuple[PanelSession, bytes]]:
+        if self.layout is not None:
+            image = self.layout.fit(image)
+            self._canvas = image
+        targets = self._targets()
+        if self.executor is None or len(targets) < 2:
+            return [(panel_session, self._build_tile(panel_session, plan, image)) for panel_session, plan in targets]
+        loop = asyncio.get_running_loop()
+        frames = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, self._build_tile, panel_session, plan, image)
+                for panel_session, plan in targets
+            )
+        )
+        return [(panel_session, frame) for (panel_session, _plan), frame in zip(targets, frames)]
+
+    @staticmethod
+    def _build_tile(panel_session: PanelSession, plan: Optional[TilePlan], canvas: Image.Image) -> bytes:
+        tile = plan.extract(canvas) if plan is not None else canvas
+        return panel_session.session.build_image_frame(tile)
+
+    async def _send_tile(
+        self,
+        panel_session: PanelSession,
+        frame: bytes,
+        delay: float,
+        barrier: Optional[CommitBarrier] = None,
+    ) -> None:
+        panel_session.last_checksum = None
+        try:
+            await panel_session.session.send_frame(frame, delay, barrier)
+        except Exception as error:
+            self._record_error(panel_session, error)
+            raise
+        self._mark_displayed(panel_session, frame)
+
+    def _on_submitted(self, panel_session: PanelSession, frame: bytes, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._record_error(panel_session, future.exception())
+        elif future.result():
+            self._mark_displayed(panel_session, frame)
+
+    def _record_error(self, panel_session: PanelSession, error: BaseException) -> None:
+        panel_session.error = error
+        panel_session.failures += 1
+        self._report_failure(panel_session.session.name, error)
+
+    def _mark_displayed(self, panel_session: PanelSession, frame: bytes) -> None:
+        panel_session.error = None
+        panel_session.last_checksum = frame_checksum(frame)
+        panel_session.last_connection = panel_session.session.connections
+        panel_session.last_sent_at = asyncio.get_running_loop().time()
+
+    def _unchanged(self, panel_session: PanelSession, frame: bytes) -> bool:
+        display = self.config.display
+        if not display.skip_unchanged or panel_session.last_checksum is None:
+            return False
+        session = panel_session.session
+        if session.transport is None or not session.transport.is_connected:
+            return False
+        if panel_session.last_connection != session.connections or not session.queue.idle:
+            return False
+        if panel_session.last_checksum != frame_checksum(frame):
+            return False
+        age = asyncio.get_running_loop().time() - panel_session.last_sent_at
+        return display.refresh_interval <= 0 or age < display.refresh_interval
+
+    async def flush(self) -> None:
+        if self._submitted:
+            await asyncio.wait(self._submitted)
+        self._collect_submitted()
+
+    def queue_stats(self) -> dict[str, dict[str, int]]:
+        stats: dict[str, dict[str, int]] = {}
         for panel_session in self.sessions:
-            descriptor = panel_session.descriptor
-            if descriptor is None:
-                continue
-            left = descriptor.grid_x * self.tile_width
-            top = descriptor.grid_y * self.tile_height
-            right = left + self.tile_width
-            bottom = top + self.tile_height
-            region = image.crop((left, top, right, bottom))
-            buffer = BytesIO()
-            region.save(buffer, format="PNG", optimize=False)
-            tasks.append(panel_session.session.send_png(buffer.getvalue(), delay))
-        await asyncio.gather(*tasks)
+            name = panel_session.descriptor.name if panel_session.descriptor else panel_session.session.address
+            stats[name] = panel_session.session.queue.stats()
+        return stats
+
+    def panel_status(self) -> dict[str, dict[str, object]]:
+        status: dict[str, dict[str, object]] = {}
+        for panel_session in self.sessions:
+            session = panel_session.session
+            status[session.name] = {
+                "attached": True,
+                "connected": session.transport is not None and session.transport.is_connected,
+                "failures": panel_session.failures,
+                "error": repr(panel_session.error) if panel_session.error is not None else None,
+            }
+        for name in self._attaching:
+            status[name] = {"attached": False, "connected": False, "failures": 0, "error": None}
+        return status
+
+    def _collect_submitted(self) -> None:
+        pending: List[asyncio.Future] = []
+        error: Optional[BaseException] = None
+        for future in self._submitted:
+            if not future.done():
+                pending.append(future)
+            elif not future.cancelled() and future.exception() is not None and error is None:
+                error = future.exception()
+        self._submitted = pending
+        if error is not None and not self._attaching and all(item.error is not None for item in self.sessions):
+            raise error
 
+    def _targets(self) -> List[tuple[PanelSession, Optional[TilePlan]]]:
+        if self.layout is None:
+            return [(self.sessions[0], None)]
+        return [
+            (panel_session, self.layout.tile_for(panel_session.descriptor))
+            for panel_session in self.sessions
+            if panel_session.descriptor is not None
+        ]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from bleak import BleakScanner
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+
+@dataclass
+class SeenDevice:
+    device: BLEDevice
+    rssi: Optional[int]
+    seen_at: float
+
+
+class DeviceRegistry:
+    def __init__(self, ttl: float = 60.0, adapter: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.adapter = adapter
+        self.entries: dict[str, SeenDevice] = {}
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+        self._waiters: list[tuple[set[str], asyncio.Event]] = []
+        self._scanner: Optional[BleakScanner] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def scanning(self) -> bool:
+        return self._scanner is not None
+
+    def _scanner_options(self) -> dict[str, object]:
+        return {"bluez": {"adapter": self.adapter}} if self.adapter else {}
+
+    def _on_advertisement(self, device: BLEDevice, advertisement: AdvertisementData) -> None:
+        address = device.address.upper()
+        self.entries[address] = SeenDevice(device, advertisement.rssi, time.monotonic())
+        for wanted, event in self._waiters:
+            if address in wanted and all(self.lookup(item) is not None for item in wanted):
+                event.set()
+
+    def lookup(self, address: str) -> Optional[BLEDevice]:
+        entry = self.entries.get(address.upper())
+        if entry is None:
+            return None
+        if self.ttl > 0 and time.monotonic() - entry.seen_at > self.ttl:
+            return None
+        return entry.device
+
+    def rssi(self, address: str) -> Optional[int]:
+        entry = self.entries.get(address.upper())
+        return entry.rssi if entry else None
+
+    def forget(self, address: str) -> None:
+        self.entries.pop(address.upper(), None)
+
+    async def start(self) -> None:
+        if self._scanner is not None:
+            return
+        scanner = BleakScanner(detection_callback=self._on_advertisement, **self._scanner_options())
+        await scanner.start()
+        self._scanner = scanner
+
+    async def stop(self) -> None:
+        if self._scanner is None:
+            return
+        scanner = self._scanner
+        self._scanner = None
+        try:
+            await scanner.stop()
+        except Exception:
+            pass
+
+    async def resolve(self, address: str, timeout: float) -> Optional[BLEDevice]:
+        found = await self.resolve_many([address], timeout)
+        return found.get(address.upper())
+
+    async def resolve_many(self, addresses: Iterable[str], timeout: float) -> dict[str, BLEDevice]:
+        wanted = {address.upper() for address in addresses}
+        found = self._collect(wanted)
+        self.hits += len(found)
+        missing = wanted - found.keys()
+        if not missing:
+            return found
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            found.update(self._collect(missing))
+            missing -= found.keys()
+            if missing:
+                self.misses += len(missing)
+                await self._scan(missing, timeout)
+                found.update(self._collect(missing))
+        return found
+
+    def _collect(self, addresses: Iterable[str]) -> dict[str, BLEDevice]:
+        found: dict[str, BLEDevice] = {}
+        for address in addresses:
+            device = self.lookup(address)
+            if device is not None:
+                found[address] = device
+        return found
+
+    async def _scan(self, wanted: set[str], timeout: float) -> None:
+        self.scans += 1
+        event = asyncio.Event()
+        waiter = (wanted, event)
+        self._waiters.append(waiter)
+        try:
+            if self._scanner is not None:
+                await self._wait(event, timeout)
+                return
+            scanner = BleakScanner(detection_callback=self._on_advertisement, **self._scanner_options())
+            await scanner.start()
+            try:
+                await self._wait(event, timeout)
+            finally:
+                await scanner.stop()
+        finally:
+            self._waiters.remove(waiter)
+
+    @staticmethod
+    async def _wait(event: asyncio.Event, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+DEFAULT_REGISTRY = DeviceRegistry()
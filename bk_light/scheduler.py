@@ -0,0 +1,79 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+CONTROL_WRITE_LIMIT = 64
+
+
+class WriteScheduler:
+    def __init__(self, window: int = 4) -> None:
+        self.window = max(1, window)
+        self.active = 0
+        self.priorities: dict[str, int] = {}
+        self.rotation: deque[str] = deque()
+        self.waiting: dict[str, deque[tuple[asyncio.Future, bool]]] = {}
+        self.grants: dict[str, int] = {}
+
+    def register(self, name: str, priority: int = 0) -> None:
+        self.priorities[name] = priority
+        if name not in self.rotation:
+            self.rotation.append(name)
+
+    async def acquire(self, name: str, size: int = 0) -> None:
+        if name not in self.priorities:
+            self.register(name)
+        if self.active >= self.window or self._has_waiters():
+            future = asyncio.get_running_loop().create_future()
+            self.waiting.setdefault(name, deque()).append((future, size <= CONTROL_WRITE_LIMIT))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release(name)
+                raise
+        else:
+            self.active += 1
+            self._granted(name)
+
+    @asynccontextmanager
+    async def turn(self, name: str, size: int = 0) -> AsyncIterator[None]:
+        await self.acquire(name, size)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def release(self, name: str) -> None:
+        while True:
+            candidate = self._next()
+            if candidate is None:
+                self.active -= 1
+                return
+            future, _control = self.waiting[candidate].popleft()
+            if not future.cancelled():
+                self._granted(candidate)
+                future.set_result(None)
+                return
+
+    def _granted(self, name: str) -> None:
+        self.grants[name] = self.grants.get(name, 0) + 1
+        self.rotation.remove(name)
+        self.rotation.append(name)
+
+    def _has_waiters(self) -> bool:
+        return any(not future.cancelled() for queue in self.waiting.values() for future, _control in queue)
+
+    def _next(self) -> Optional[str]:
+        best = None
+        best_rank = None
+        for name in self.rotation:
+            queue = self.waiting.get(name)
+            if not queue:
+                continue
+            rank = (queue[0][1], self.priorities.get(name, 0))
+            if best_rank is None or rank > best_rank:
+                best = name
+                best_rank = rank
+        return best
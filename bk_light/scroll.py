@@ -0,0 +1,134 @@
+from __future__ import annotations
+from typing import Optional
+from PIL import Image
+from .effects import RGB, TextEffect, colorize
+
+BLANK = {"L": 0, "RGB": (0, 0, 0), "RGBA": (0, 0, 0, 0)}
+
+
+class ScrollStrip:
+    def __init__(
+        self,
+        source: Image.Image,
+        canvas: tuple[int, int],
+        background: RGB,
+        gap: int = 0,
+        offset_y: int = 0,
+        effect: Optional[TextEffect] = None,
+    ) -> None:
+        self.canvas = canvas
+        self.background = tuple(background)
+        self.effect = effect or TextEffect()
+        self.source = source
+        self.period = max(1, source.width + gap)
+        self.top = (canvas[1] - source.height) // 2 + offset_y
+        self.width = self.period + canvas[0]
+        self.mask = self._tile(source.getchannel("A") if source.mode == "RGBA" else source, 0, self.width)
+        self.strip: Optional[Image.Image] = None
+        if source.mode == "RGBA":
+            self.strip = self._paint(self._tile(self.source, 0, self.width))
+        elif not self.dynamic:
+            self.strip = self._paint(self._colorize(self.mask, 0, 0.0))
+
+    @property
+    def dynamic(self) -> bool:
+        return self.source.mode != "RGBA" and self.effect.dynamic
+
+    def start(self, position: int, direction: str = "left", offset_x: int = 0) -> int:
+        shift = position % self.period
+        if direction == "left":
+            return (shift - offset_x) % self.period
+        return (-offset_x - shift) % self.period
+
+    def frame(self, position: int, direction: str = "left", offset_x: int = 0, elapsed: float = 0.0) -> Image.Image:
+        start = self.start(position, direction, offset_x)
+        box = (start, 0, start + self.canvas[0], self.canvas[1])
+        if self.strip is not None:
+            return self.strip.crop(box)
+        return self._paint(self._colorize(self.mask.crop(box), start, elapsed))
+
+    def _colorize(self, mask: Image.Image, start: int, elapsed: float) -> Image.Image:
+        fill = self.effect.fill(self.source.size, elapsed)
+        if isinstance(fill, Image.Image):
+            fill = self._tile(fill, start, mask.width)
+        return colorize(mask, fill)
+
+    def _tile(self, image: Image.Image, start: int, width: int) -> Image.Image:
+        tiled = Image.new(image.mode, (width, self.canvas[1]), BLANK.get(image.mode, 0))
+        image = image.crop((0, 0, min(image.width, self.period), image.height))
+        x = (start // self.period) * self.period - start
+        while x < width:
+            tiled.paste(image, (x, self.top))
+            x += self.period
+        return tiled
+
+    def _paint(self, layer: Image.Image) -> Image.Image:
+        frame = Image.new("RGB", layer.size, self.background)
+        frame.paste(layer, (0, 0), layer)
+        return frame
+
+
+class ScrollClock:
+    def __init__(
+        self,
+        speed: float,
+        interval: float,
+        step: int = 1,
+        started: float = 0.0,
+        report_every: float = 5.0,
+    ) -> None:
+        self.speed = max(0.0, speed)
+        self.interval = max(0.001, interval)
+        self.step = max(1, step)
+        self.started = started
+        self.report_every = report_every
+        self.frames = 0
+        self.skipped = 0
+        self.last_position: Optional[int] = None
+        self.last_frame: Optional[float] = None
+        self._window_start = started
+        self._window_frames = 0
+        self._window_delivered = 0
+
+    @property
+    def target_fps(self) -> float:
+        return 1.0 / self.interval
+
+    def position(self, now: float) -> int:
+        travelled = int(max(0.0, now - self.started) * self.speed)
+        return travelled - travelled % self.step
+
+    def advance(self, now: float) -> int:
+        position = self.position(now)
+        if self.last_position is not None:
+            expected = self.speed * self.interval
+            self.skipped += max(0, int((position - self.last_position - expected) // self.step))
+        self.last_position = position
+        self.last_frame = now
+        self.frames += 1
+        self._window_frames += 1
+        return position
+
+    def delay(self, now: float) -> float:
+        if self.last_frame is None:
+            return 0.0
+        return max(0.0, self.last_frame + self.interval - now)
+
+    def fps(self, now: float) -> float:
+        elapsed = now - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def report(self, now: float, delivered: int = 0) -> Optional[dict[str, float]]:
+        window = now - self._window_start
+        if self.report_every <= 0 or window < self.report_every:
+            return None
+        stats = {
+            "fps": self._window_frames / window,
+            "delivered_fps": max(0, delivered - self._window_delivered) / window,
+            "target_fps": self.target_fps,
+            "skipped": self.skipped,
+        }
+        self._window_start = now
+        self._window_frames = 0
+        self._window_delivered = delivered
+        return stats
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakError
+from .registry import DEFAULT_REGISTRY, DeviceRegistry
+
+NotificationHandler = Callable[[int, bytearray], None]
+DisconnectHandler = Callable[["Transport"], None]
+
+
+class Transport(ABC):
+    address: str
+
+    @property
+    @abstractmethod
+    def is_connected(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def mtu_size(self) -> int:
+        return 23
+
+    @abstractmethod
+    async def connect(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        raise NotImplementedError
+
+    async def exchange_mtu(self, mtu: int) -> None:
+        return None
+
+    @abstractmethod
+    async def start_notify(self, uuid: str, handler: NotificationHandler) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stop_notify(self, uuid: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def write(self, uuid: str, data: bytes, response: bool) -> None:
+        raise NotImplementedError
+
+
+TransportFactory = Callable[..., Transport]
+
+
+class BleakTransport(Transport):
+    def __init__(
+        self,
+        address: str,
+        scan_timeout: float = 6.0,
+        registry: Optional[DeviceRegistry] = None,
+        on_disconnect: Optional[DisconnectHandler] = None,
+        adapter: Optional[str] = None,
+    ) -> None:
+        self.address = address
+        self.adapter = adapter
+        self.scan_timeout = scan_timeout
+        if registry is None:
+            registry = DeviceRegistry(adapter=adapter) if adapter else DEFAULT_REGISTRY
+        self.registry = registry
+        self.on_disconnect = on_disconnect
+        self.client: Optional[BleakClient] = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.client is not None and self.client.is_connected
+
+    @property
+    def mtu_size(self) -> int:
+        if self.client is None:
+            return 23
+        return self.client.mtu_size
+
+    async def _find_cached_device(self):
+        options = {"bluez": {"adapter": self.adapter}} if self.adapter else {}
+        try:
+            return await BleakScanner.find_device_by_address(
+                self.address, timeout=self.scan_timeout, cached=True, **options
+            )
+        except TypeError:
+            return await BleakScanner.find_device_by_address(self.address, timeout=self.scan_timeout, **options)
+
+    async def connect(self) -> None:
+        device = await self.registry.resolve(self.address, self.scan_timeout)
+        if device is None:
+            device = await self._find_cached_device()
+        if device is None:
+            raise BleakError(f"Device with address {self.address} was not found")
+        options = {"bluez": {"adapter": self.adapter}} if self.adapter else {}
+        self.client = BleakClient(device, disconnected_callback=self._handle_disconnect, **options)
+        try:
+            await self.client.connect()
+        except Exception:
+            self.registry.forget(self.address)
+            raise
+
+    def _handle_disconnect(self, _client: BleakClient) -> None:
+        if self.on_disconnect is not None:
+            self.on_disconnect(self)
+
+    async def disconnect(self) -> None:
+        if self.client is None:
+            return
+        try:
+            await self.client.disconnect()
+        finally:
+            self.client = None
+
+    async def exchange_mtu(self, mtu: int) -> None:
+        backend = getattr(self.client, "_backend", None)
+        acquire = getattr(backend, "_acquire_mtu", None)
+        if acquire is not None:
+            await acquire()
+
+    async def start_notify(self, uuid: str, handler: NotificationHandler) -> None:
+        await self.client.start_notify(uuid, handler)
+
+    async def stop_notify(self, uuid: str) -> None:
+        await self.client.stop_notify(uuid)
+
+    async def write(self, uuid: str, data: bytes, response: bool) -> None:
+        await self.client.write_gatt_char(uuid, data, response=response)
@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+from PIL import Image
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from bk_light.config import AppConfig, DeviceConfig, DisplayConfig, PanelDescriptor, PanelsConfig
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.fonts import get_font_profile, resolve_font
+from bk_light.metrics import MetricsRecorder
+from bk_light.panel_manager import PanelManager
+from bk_light.scroll import ScrollStrip
+from bk_light.text import build_text_bitmap
+from scripts.clock_display import build_clock_image
+from scripts.display_text import render_static_frame
+from scripts.increment_counter import build_counter_image
+
+WORKLOADS = ("static", "clock", "scroll", "counter")
+WALLS = (1, 4, 16)
+STAGES = ("render", "encode", "crc", "handshake", "write", "ack")
+
+Renderer = Callable[[int], Image.Image]
+
+
+class SampleExporter:
+    def __init__(self) -> None:
+        self.stages: dict[str, list[float]] = {stage: [] for stage in STAGES}
+
+    def record(self, event: dict[str, object]) -> None:
+        if event["type"] == "span":
+            self.stages.setdefault(str(event["stage"]), []).append(float(event["seconds"]))
+
+    def close(self) -> None:
+        return None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+    }
+
+
+def counter_totals(metrics: MetricsRecorder) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for (_panel, counter), value in metrics.counters.items():
+        totals[counter] = totals.get(counter, 0) + value
+    return totals
+
+
+def wall_shape(panels: int) -> tuple[int, int]:
+    columns = int(math.isqrt(panels))
+    if columns * columns == panels:
+        return columns, columns
+    return panels, 1
+
+
+def build_config(panels: int, args: argparse.Namespace) -> AppConfig:
+    columns, rows = wall_shape(panels)
+    items = [
+        PanelDescriptor(
+            name=f"panel_{index + 1}",
+            address=f"BE:00:00:00:00:{index:02X}",
+            grid_x=index % columns,
+            grid_y=index // columns,
+        )
+        for index in range(panels)
+    ]
+    return AppConfig(
+        device=DeviceConfig(reconnect_delay=0.1, scan_timeout=1.0),
+        display=DisplayConfig(
+            streaming=args.streaming,
+            max_retries=args.retries,
+            skip_unchanged=args.skip_unchanged,
+            frame_cache_bytes=args.frame_cache_bytes,
+        ),
+        panels=PanelsConfig(columns=columns, rows=rows, items=items),
+    )
+
+
+def build_renderer(workload: str, canvas: tuple[int, int]) -> Renderer:
+    font_path = resolve_font("aldopc")
+    profile = get_font_profile("aldopc", font_path)
+    size = profile.recommended_size or 16
+    color = (226, 232, 255)
+    background = (0, 0, 0)
+    if workload == "static":
+        bitmap = build_text_bitmap("BK", font_path, size, 1, color, False)
+        return lambda _index: render_static_frame(canvas, bitmap, background, 0, 0)
+    if workload == "clock":
+        def render_clock(index: int) -> Image.Image:
+            stamp = "12:59" if index < 2 else "13:00"
+            return build_clock_image(
+                canvas,
+                stamp,
+                color,
+                (110, 125, 255),
+                background,
+                font_path,
+                size,
+                index % 2 == 0,
+                False,
+                profile.offset_x,
+                profile.offset_y,
+                profile.colon_dx,
+                profile.colon_top_adjust,
+                profile.colon_bottom_adjust,
+            )
+        return render_clock
+    if workload == "scroll":
+        bitmap = build_text_bitmap("HELLO WORLD", font_path, size, 1, (0, 255, 170), False)
+        strip = ScrollStrip(bitmap, canvas, background, 32)
+        return lambda index: strip.frame(index * 2)
+    if workload == "counter":
+        return lambda index: build_counter_image(canvas, index, color, background, font_path, size, 1, 0, 0, False)
+    raise ValueError(f"Unsupported workload '{workload}'")
+
+
+async def run_case(workload: str, panels: int, args: argparse.Namespace) -> dict[str, object]:
+    profile = LinkProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        mtu=args.mtu,
+        bytes_per_second=args.throughput,
+        loss=args.loss,
+    )
+    emulator = BleEmulator(profile, seed=args.seed)
+    config = build_config(panels, args)
+    for descriptor in config.panels.items:
+        emulator.add_panel(descriptor.address, config.panels.tile_width, config.panels.tile_height)
+    samples = SampleExporter()
+    metrics = MetricsRecorder([samples])
+    latencies: list[float] = []
+    async with PanelManager(config, transport_factory=emulator.transport_factory, metrics=metrics) as manager:
+        render = build_renderer(workload, manager.canvas_size)
+        started = time.perf_counter()
+        for index in range(args.frames):
+            frame_started = time.perf_counter()
+            with metrics.span("wall", "render"):
+                image = render(index)
+            await manager.send_image(image, delay=args.delay)
+            latencies.append(time.perf_counter() - frame_started)
+        elapsed = time.perf_counter() - started
+        cache = manager.frame_cache.stats() if manager.frame_cache is not None else {}
+    counters = counter_totals(metrics)
+    return {
+        "workload": workload,
+        "panels": panels,
+        "frames": args.frames,
+        "fps": round(args.frames / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency": summarize(latencies),
+        "stages": {stage: summarize(values) for stage, values in samples.stages.items()},
+        "counters": counters,
+        "skipped_frames": int(counters.get("frames_skipped", 0)),
+        "cached_frames": cache.get("hits", 0),
+        "panel_frames": sum(panel.frames_received for panel in emulator.panels.values()),
+    }
+
+
+def compare(results: list[dict[str, object]], baseline_path: Path, tolerance: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    reference = {(entry["workload"], entry["panels"]): entry for entry in baseline.get("results", [])}
+    failures: list[str] = []
+    for entry in results:
+        previous = reference.get((entry["workload"], entry["panels"]))
+        if previous is None:
+            continue
+        floor = float(previous["fps"]) * (1.0 - tolerance)
+        if float(entry["fps"]) < floor:
+            failures.append(
+                f"{entry['workload']}/{entry['panels']}: {entry['fps']} fps < {previous['fps']} fps baseline"
+            )
+    return failures
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict[str, object]]:
+    results: list[dict[str, object]] = []
+    for panels in args.panels:
+        for workload in args.workloads:
+            result = await run_case(workload, panels, args)
+            latency = result["latency"]
+            print(
+                f"{workload:8} {panels:3} panels  {result['fps']:8.2f} fps  "
+                f"p50 {latency['p50_ms']:8.2f} ms  p95 {latency['p95_ms']:8.2f} ms  p99 {latency['p99_ms']:8.2f} ms  "
+                f"skipped {result['skipped_frames']}  cached {result['cached_frames']}"
+            )
+            results.append(result)
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--panels", nargs="+", type=int, default=list(WALLS))
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--delay", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--mtu", type=int, default=247)
+    parser.add_argument("--throughput", type=float, default=0.0, help="Emulated link bytes per second (0 = unlimited)")
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--skip-unchanged", action="store_true", help="Skip tiles whose frame did not change")
+    parser.add_argument("--frame-cache-bytes", type=int, default=0, help="Encoded frame cache size (0 = disabled)")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> int:
+    results = asyncio.run(run_benchmark(args))
+    report = {
+        "settings": {
+            key: value for key, value in vars(args).items() if key not in {"output", "baseline"}
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline:
+        failures = compare(results, args.baseline, args.max_regression)
+        for failure in failures:
+            print("REGRESSION", failure)
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
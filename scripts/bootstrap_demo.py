@@ -1,6 +1,5 @@
 import asyncio
 import sys
-from io import BytesIO
 from pathlib import Path
 from typing import List
 from bleak import BleakScanner
@@ -15,13 +14,10 @@ from bk_light.display_session import BleDisplaySession
 PREFIXES = ("LED_BLE_", "BK_LIGHT", "BJ_LED")
 
 
-def build_logo_png() -> bytes:
+def build_logo_image() -> Image.Image:
     asset_path = Path(__file__).resolve().parents[1] / "assets" / "bklight-boot.png"
     image = Image.open(asset_path).convert("RGB")
-    fitted = ImageOps.fit(image, (32, 32), method=Image.Resampling.LANCZOS)
-    buffer = BytesIO()
-    fitted.save(buffer, format="PNG", optimize=False)
-    return buffer.getvalue()
+    return ImageOps.fit(image, (32, 32), method=Image.Resampling.LANCZOS)
 
 
 async def scan_devices(timeout: float = 8.0) -> List:
@@ -50,8 +46,7 @@ async def main() -> None:
     print(f"Connecting to {target.name} {target.address}")
     try:
         async with BleDisplaySession(target.address) as session:
-            png_bytes = build_logo_png()
-            await session.send_png(png_bytes)
+            await session.send_image(build_logo_image())
         print("Logo sent.")
     except Exception as error:
         print("ERROR", str(error))
@@ -215,7 +215,7 @@ async def run_clock(config: AppConfig, preset_name: str, overrides: dict[str, Op
                         profile.colon_top_adjust,
                         profile.colon_bottom_adjust,
                     )
-                    await manager.send_image(image, delay=0.15)
+                    await manager.submit_image(image, delay=0.15)
                     last_stamp = stamp
                     last_colon = colon_visible
                 await asyncio.sleep(interval)
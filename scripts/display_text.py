@@ -11,9 +11,11 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from bk_light.config import AppConfig, load_config, text_options
+from bk_light.effects import EFFECTS, TextEffect
 from bk_light.fonts import get_font_profile, resolve_font
 from bk_light.panel_manager import PanelManager
-from bk_light.text import build_text_bitmap
+from bk_light.scroll import ScrollClock, ScrollStrip
+from bk_light.text import build_text_mask
 
 
 def parse_color(value: Optional[str]) -> Optional[tuple[int, int, int]]:
@@ -42,36 +44,12 @@ def render_static_frame(
     return frame.convert("RGB")
 
 
-def render_scroll_frame(
-    canvas: tuple[int, int],
-    text_bitmap: Image.Image,
-    background: tuple[int, int, int],
-    direction: str,
-    gap: int,
-    offset_x: int,
-    offset_y: int,
-    position: int,
-) -> Image.Image:
-    strip_width = max(1, text_bitmap.width + gap)
-    strip = Image.new("RGBA", (strip_width, canvas[1]), tuple(background) + (255,))
-    y = (canvas[1] - text_bitmap.height) // 2 + offset_y
-    strip.paste(text_bitmap, (0, y), text_bitmap)
-    shift = position % strip_width
-    start = offset_x - shift if direction == "left" else offset_x + shift
-    while start > -strip_width:
-        start -= strip_width
-    frame = Image.new("RGBA", canvas, tuple(background) + (255,))
-    x = start
-    while x < canvas[0]:
-        frame.paste(strip, (int(x), 0), strip)
-        x += strip_width
-    return frame.convert("RGB")
-
-
 async def display_text(config: AppConfig, message: str, preset_name: str, overrides: dict[str, Optional[str]]) -> None:
     preset = text_options(config, preset_name, overrides)
     color = parse_color(overrides.get("color")) or parse_color(preset.color)
     background = parse_color(overrides.get("background")) or parse_color(preset.background)
+    accent = parse_color(overrides.get("accent")) or parse_color(preset.accent)
+    effect = TextEffect(preset.effect, color, accent, preset.effect_period)
     font_ref = overrides.get("font") or preset.font
     font_path = resolve_font(font_ref)
     profile = get_font_profile(font_ref, font_path)
@@ -84,44 +62,60 @@ async def display_text(config: AppConfig, message: str, preset_name: str, overri
     size = max(1, int(round(size)))
     spacing_override = overrides.get("spacing")
     spacing = int(spacing_override) if spacing_override is not None else preset.spacing
-    text_bitmap = build_text_bitmap(
+    text_mask = build_text_mask(
         message,
         font_path,
         size,
         spacing,
-        color,
         config.display.antialias_text,
         monospace_digits=True,
     )
+    text_bitmap = effect.render(text_mask)
     offset_x_base = preset.offset_x + profile.offset_x
     offset_y_base = preset.offset_y + profile.offset_y
     try:
         async with PanelManager(config) as manager:
             canvas = manager.canvas_size
+            loop = asyncio.get_running_loop()
+            started = loop.time()
             if preset.mode == "scroll":
                 gap_override = overrides.get("gap")
                 base_gap = gap_override if gap_override is not None else preset.gap
                 gap = int(base_gap) if base_gap is not None else 0
-                strip_width = max(1, text_bitmap.width + gap)
+                strip = ScrollStrip(text_mask, canvas, background, gap, offset_y_base, effect)
                 step_override = overrides.get("step")
                 base_step = step_override if step_override is not None else preset.step
                 step_value = int(base_step) if base_step is not None else 1
                 step = max(1, step_value)
-                position = 0
+                clock = ScrollClock(preset.speed, preset.interval, step, loop.time())
+                while True:
+                    now = loop.time()
+                    skipped = clock.skipped
+                    position = clock.advance(now)
+                    frame = strip.frame(position, preset.direction, offset_x_base, now - started)
+                    await manager.submit_image(frame, delay=0.1)
+                    if clock.skipped > skipped:
+                        manager.metrics.increment("wall", "scroll_skipped", clock.skipped - skipped)
+                    delivered = max((item["sent"] for item in manager.queue_stats().values()), default=0)
+                    stats = clock.report(loop.time(), delivered)
+                    if stats is not None:
+                        print(
+                            f"SCROLL {stats['fps']:.1f} fps rendered, {stats['delivered_fps']:.1f} fps delivered "
+                            f"(target {stats['target_fps']:.1f}), {int(stats['skipped'])} positions skipped"
+                        )
+                    await asyncio.sleep(clock.delay(loop.time()))
+            elif effect.dynamic:
                 while True:
-                    frame = render_scroll_frame(
+                    text_bitmap = effect.render(text_mask, loop.time() - started)
+                    frame = render_static_frame(
                         canvas,
                         text_bitmap,
                         background,
-                        preset.direction,
-                        gap,
                         offset_x_base,
                         offset_y_base,
-                        position,
                     )
-                    await manager.send_image(frame, delay=0.1)
+                    await manager.submit_image(frame, delay=0.1)
                     await asyncio.sleep(preset.interval)
-                    position = (position + step) % strip_width
             else:
                 frame = render_static_frame(
                     canvas,
@@ -157,6 +151,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--offset-x", type=int)
     parser.add_argument("--offset-y", type=int)
     parser.add_argument("--interval", type=float)
+    parser.add_argument("--effect", choices=EFFECTS)
+    parser.add_argument("--accent")
+    parser.add_argument("--effect-period", type=float)
     return parser.parse_args()
 
 
@@ -175,6 +172,9 @@ def build_override_map(args: argparse.Namespace) -> dict[str, Optional[str]]:
         "offset_x": args.offset_x,
         "offset_y": args.offset_y,
         "interval": args.interval,
+        "effect": args.effect,
+        "accent": args.accent,
+        "effect_period": args.effect_period,
     }
 
 
@@ -2,7 +2,6 @@ import argparse
 import asyncio
 import sys
 from dataclasses import replace
-from io import BytesIO
 from pathlib import Path
 from typing import Optional
 from PIL import Image, ImageDraw, ImageFont
@@ -21,7 +20,7 @@ def build_panel_image(
     tile_height: int,
     color: tuple[int, int, int],
     antialias: bool,
-) -> bytes:
+) -> Image.Image:
     background = (0, 0, 0)
     font = ImageFont.load_default()
     dummy = Image.new("L", (1, 1), 0)
@@ -46,14 +45,14 @@ def build_panel_image(
     frame_rgb = frame.convert("RGB")
     draw = ImageDraw.Draw(frame_rgb)
     draw.rectangle((0, 0, tile_width - 1, tile_height - 1), outline=(50, 50, 50))
-    buffer = BytesIO()
-    frame_rgb.save(buffer, format="PNG", optimize=False)
-    return buffer.getvalue()
+    return frame_rgb
 
 
 async def display_panel(index: int, descriptor: PanelDescriptor, config: AppConfig) -> None:
     rotation = descriptor.rotation if descriptor.rotation is not None else config.device.rotate
     brightness = descriptor.brightness if descriptor.brightness is not None else config.device.brightness
+    gamma = descriptor.gamma if descriptor.gamma is not None else config.device.gamma
+    white_balance = descriptor.white_balance if descriptor.white_balance is not None else config.device.white_balance
     session = BleDisplaySession(
         address=descriptor.address,
         auto_reconnect=False,
@@ -62,18 +61,20 @@ async def display_panel(index: int, descriptor: PanelDescriptor, config: AppConf
         brightness=brightness,
         mtu=config.device.mtu,
         log_notifications=config.display.log_notifications,
+        gamma=gamma,
+        white_balance=white_balance,
     )
     try:
         async with session:
             color = (255, 120, 0)
-            payload = build_panel_image(
+            image = build_panel_image(
                 index,
                 config.panels.tile_width,
                 config.panels.tile_height,
                 color,
                 config.display.antialias_text,
             )
-            await session.send_png(payload, delay=0.1)
+            await session.send_image(image, delay=0.1)
             print(f"[{index}] {descriptor.name} @ {descriptor.address} (grid {descriptor.grid_x}, {descriptor.grid_y})")
             await asyncio.to_thread(input, "Press Enter to continue...")
     except Exception as error:
@@ -1,7 +1,6 @@
 import argparse
 import asyncio
 import sys
-from io import BytesIO
 from PIL import Image
 from pathlib import Path
 
@@ -12,21 +11,19 @@ if str(project_root) not in sys.path:
 from bk_light.display_session import BleDisplaySession
 
 
-def build_png() -> bytes:
+def build_image() -> Image.Image:
     image = Image.new("RGB", (32, 32), (0, 0, 0))
     width, height = image.size
     corners = ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1))
     for x, y in corners:
         image.putpixel((x, y), (255, 0, 0))
-    buffer = BytesIO()
-    image.save(buffer, format="PNG", optimize=False)
-    return buffer.getvalue()
+    return image
 
 
 async def push_red_corners(address: str | None) -> None:
     try:
         async with BleDisplaySession(address) as session:
-            await session.send_png(build_png())
+            await session.send_image(build_image())
         print("DONE")
     except Exception as error:
         print("ERROR", str(error))
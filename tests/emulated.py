@@ -0,0 +1,48 @@
+from bleak.exc import BleakError
+from bk_light.display_session import HANDSHAKE_FIRST, HANDSHAKE_SECOND
+from bk_light.emulator import BleEmulator, EmulatedTransport, LinkProfile
+
+
+class LossyTransport(EmulatedTransport):
+    def __init__(self, emulator: BleEmulator, address: str, drops: dict[bytes, int]) -> None:
+        super().__init__(emulator, address)
+        self.drops = drops
+
+    def _notify(self, profile: LinkProfile, payload: bytes) -> None:
+        if self.drops.get(payload, 0) > 0:
+            self.drops[payload] -= 1
+            return
+        super()._notify(profile, payload)
+
+
+def lossy_factory(emulator: BleEmulator, drops: dict[bytes, int]):
+    def factory(address: str, **_options) -> LossyTransport:
+        transport = LossyTransport(emulator, address, drops)
+        emulator.transports.append(transport)
+        return transport
+
+    return factory
+
+
+class RejectingTransport(EmulatedTransport):
+    def __init__(self, emulator: BleEmulator, address: str, rejections: list[int]) -> None:
+        super().__init__(emulator, address)
+        self.rejections = rejections
+        self.chunks = 0
+
+    async def write(self, uuid: str, data: bytes, response: bool) -> None:
+        if not response and data not in (HANDSHAKE_FIRST, HANDSHAKE_SECOND):
+            self.chunks += 1
+            if self.rejections and self.chunks == self.rejections[0]:
+                self.rejections.pop(0)
+                raise BleakError("Write without response is not permitted for frame data")
+        await super().write(uuid, data, response)
+
+
+def rejecting_factory(emulator: BleEmulator, rejections: list[int]):
+    def factory(address: str, **_options) -> RejectingTransport:
+        transport = RejectingTransport(emulator, address, rejections)
+        emulator.transports.append(transport)
+        return transport
+
+    return factory
@@ -0,0 +1,97 @@
+import asyncio
+import time
+import pytest
+from bleak import BleakClient, BleakScanner
+from bleak.backends.device import BLEDevice
+from bk_light.adapters import AdapterPool
+from bk_light.config import AppConfig, DeviceConfig, DisplayConfig, PanelDescriptor, PanelsConfig
+from bk_light.emulator import BleEmulator
+from bk_light.panel_manager import PanelManager
+from bk_light.registry import DeviceRegistry, SeenDevice
+from bk_light.transport import BleakTransport
+
+
+def descriptors(count: int) -> list[PanelDescriptor]:
+    return [
+        PanelDescriptor(
+            name=f"panel_{index + 1}",
+            address=f"BE:00:00:00:00:{index:02X}",
+            grid_x=index % 6,
+            grid_y=index // 6,
+        )
+        for index in range(count)
+    ]
+
+
+def build_wall(adapters: list[str]) -> AppConfig:
+    return AppConfig(
+        device=DeviceConfig(reconnect_delay=0.01, adapters=adapters, max_connecting=2, connect_stagger=0.0),
+        display=DisplayConfig(max_retries=0),
+        panels=PanelsConfig(columns=6, rows=4, items=descriptors(24)),
+    )
+
+
+def emulated_wall(config: AppConfig) -> BleEmulator:
+    emulator = BleEmulator(scan_time=0.0, max_links=12, max_connecting=2)
+    for descriptor in config.panels.items:
+        emulator.add_panel(descriptor.address)
+    return emulator
+
+
+def test_assign_balances_and_honours_pinned_adapters():
+    pool = AdapterPool(["hci0", "hci1"])
+    items = descriptors(5)
+    items[0].adapter = "hci1"
+    items[1].adapter = "hci1"
+    assignments = pool.assign(items)
+    assert list(assignments.values()).count("hci1") == 2
+    assert list(assignments.values()).count("hci0") == 3
+    assert pool.adapter_for(items[0].address) == "hci1"
+
+
+def test_large_wall_exceeds_a_single_adapter():
+    async def scenario() -> None:
+        config = build_wall([])
+        emulator = emulated_wall(config)
+        with pytest.raises(Exception):
+            async with PanelManager(config, transport_factory=emulator.transport_factory):
+                pass
+        assert emulator.links("default") == 0
+
+    asyncio.run(scenario())
+
+
+def test_large_wall_connects_across_two_adapters():
+    async def scenario() -> None:
+        config = build_wall(["hci0", "hci1"])
+        emulator = emulated_wall(config)
+        async with PanelManager(config, transport_factory=emulator.transport_factory) as manager:
+            assert len(manager.sessions) == 24
+            assert emulator.links("hci0") == 12
+            assert emulator.links("hci1") == 12
+        assert emulator.links("hci0") == 0
+        assert emulator.links("hci1") == 0
+
+    asyncio.run(scenario())
+
+
+def test_bleak_transports_bind_their_own_adapter(monkeypatch):
+    async def connect(_client, **_kwargs) -> None:
+        return None
+
+    async def scenario() -> list[BleakTransport]:
+        monkeypatch.setattr(BleakClient, "connect", connect)
+        transports = []
+        for index, adapter in enumerate(["hci0", "hci1", None]):
+            address = f"BE:00:00:00:00:{index:02X}"
+            registry = DeviceRegistry(adapter=adapter)
+            device = BLEDevice(address, f"panel_{index + 1}", {"path": f"/org/bluez/{adapter}/dev_{index}"})
+            registry.entries[address] = SeenDevice(device, None, time.monotonic())
+            transport = BleakTransport(address, registry=registry, adapter=adapter)
+            await transport.connect()
+            transports.append(transport)
+        return transports
+
+    transports = asyncio.run(scenario())
+    assert [transport.client._backend._adapter for transport in transports] == ["hci0", "hci1", None]
+    assert BleakScanner(**DeviceRegistry(adapter="hci1")._scanner_options())._backend._adapter == "hci1"
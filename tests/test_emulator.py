@@ -0,0 +1,72 @@
+import asyncio
+from PIL import Image
+from bk_light.display_session import (
+    ACK_STAGE_ONE,
+    ACK_STAGE_THREE,
+    ACK_STAGE_TWO,
+    HANDSHAKE_FIRST,
+    HANDSHAKE_SECOND,
+    BleDisplaySession,
+    build_frame,
+    encode_png,
+)
+from bk_light.emulator import BleEmulator, LinkProfile
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def tile(color: tuple[int, int, int]) -> Image.Image:
+    return Image.new("RGB", (32, 32), color)
+
+
+def test_handshake_acks():
+    panel = BleEmulator().add_panel(ADDRESS)
+    assert panel.receive(HANDSHAKE_FIRST) == [ACK_STAGE_ONE]
+    assert panel.receive(HANDSHAKE_SECOND) == [ACK_STAGE_TWO]
+    assert panel.handshaken
+    assert panel.handshakes == 1
+
+
+def test_frame_without_handshake_is_rejected():
+    panel = BleEmulator().add_panel(ADDRESS)
+    assert panel.receive(build_frame(encode_png(tile((255, 0, 0))))) == []
+    assert panel.rejected_frames == 1
+    assert panel.image is None
+
+
+def test_frame_with_bad_crc_is_not_acknowledged():
+    panel = BleEmulator().add_panel(ADDRESS)
+    panel.receive(HANDSHAKE_FIRST)
+    panel.receive(HANDSHAKE_SECOND)
+    frame = bytearray(build_frame(encode_png(tile((255, 0, 0)))))
+    frame[9] ^= 0xFF
+    assert panel.receive(bytes(frame)) == []
+    assert panel.crc_errors == 1
+    assert panel.image is None
+
+
+def test_chunked_frame_is_reassembled():
+    panel = BleEmulator().add_panel(ADDRESS)
+    panel.receive(HANDSHAKE_FIRST)
+    panel.receive(HANDSHAKE_SECOND)
+    frame = build_frame(encode_png(tile((0, 0, 255))))
+    notifications = []
+    for offset in range(0, len(frame), 20):
+        notifications.extend(panel.receive(frame[offset : offset + 20]))
+    assert notifications == [ACK_STAGE_THREE]
+    assert panel.image.getpixel((5, 5)) == (0, 0, 255)
+
+
+def test_session_frames_are_displayed():
+    async def scenario() -> None:
+        emulator = BleEmulator(LinkProfile(latency=0.001), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        async with BleDisplaySession(ADDRESS, transport_factory=emulator.transport_factory) as session:
+            await session.send_image(tile((10, 200, 30)), delay=0.0)
+            await session.send_image(tile((200, 10, 30)), delay=0.0)
+        assert panel.frames_received == 2
+        assert panel.handshakes == 2
+        assert emulator.displayed(ADDRESS).getpixel((0, 0)) == (200, 10, 30)
+        assert not any(transport.is_connected for transport in emulator.transports)
+
+    asyncio.run(scenario())
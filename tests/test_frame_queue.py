@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from PIL import Image
+from bk_light.config import AppConfig, DeviceConfig, DisplayConfig
+from bk_light.display_session import BleDisplaySession
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+from bk_light.panel_manager import PanelManager
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def solid(red: int) -> Image.Image:
+    return Image.new("RGB", (32, 32), (red, 0, 0))
+
+
+def queue_session(emulator: BleEmulator) -> BleDisplaySession:
+    return BleDisplaySession(ADDRESS, transport_factory=emulator.transport_factory, reconnect_delay=0.01)
+
+
+def test_newer_frame_replaces_pending_frame():
+    async def scenario():
+        emulator = BleEmulator(LinkProfile(latency=0.02), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        async with queue_session(emulator) as session:
+            first = session.submit_image(solid(10), delay=0.0)
+            await asyncio.sleep(0)
+            stale = session.submit_image(solid(20), delay=0.0)
+            latest = session.submit_image(solid(30), delay=0.0)
+            results = await asyncio.gather(first, stale, latest)
+            return results, session.queue.stats(), panel
+
+    results, stats, panel = asyncio.run(scenario())
+    assert results == [True, False, True]
+    assert stats == {"sent": 2, "dropped": 1, "expired": 0, "pending": 0}
+    assert panel.frames_received == 2
+    assert panel.image.getpixel((0, 0)) == (30, 0, 0)
+
+
+def test_frame_past_its_deadline_is_expired():
+    async def scenario():
+        emulator = BleEmulator(LinkProfile(latency=0.02), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        async with queue_session(emulator) as session:
+            first = session.submit_image(solid(10), delay=0.0)
+            await asyncio.sleep(0)
+            late = session.submit_image(solid(20), delay=0.0, deadline=0.01)
+            results = await asyncio.gather(first, late)
+            return results, session.queue.stats(), panel
+
+    results, stats, panel = asyncio.run(scenario())
+    assert results == [True, False]
+    assert stats == {"sent": 1, "dropped": 0, "expired": 1, "pending": 0}
+    assert panel.frames_received == 1
+    assert panel.image.getpixel((0, 0)) == (10, 0, 0)
+
+
+def test_sender_errors_surface_through_manager_flush():
+    async def scenario():
+        emulator = BleEmulator(LinkProfile(latency=0.002), seed=1, scan_time=0.01)
+        emulator.add_panel(ADDRESS)
+        config = AppConfig(
+            device=DeviceConfig(address=ADDRESS, auto_reconnect=False),
+            display=DisplayConfig(skip_unchanged=False),
+        )
+        metrics = MetricsRecorder([])
+        async with PanelManager(config, transport_factory=emulator.transport_factory, metrics=metrics) as manager:
+            await manager.submit_image(solid(10), delay=0.0)
+            await manager.flush()
+            sent = manager.queue_stats()[ADDRESS]["sent"]
+            del emulator.panels[ADDRESS]
+            emulator.drop_link(ADDRESS)
+            await manager.submit_image(solid(20), delay=0.0)
+            with pytest.raises(Exception) as raised:
+                await manager.flush()
+            return sent, raised.value, manager.panel_status()[ADDRESS]
+
+    sent, error, status = asyncio.run(scenario())
+    assert sent == 1
+    assert "not found" in str(error)
+    assert status["failures"] == 1
@@ -0,0 +1,53 @@
+import asyncio
+from PIL import Image
+from bk_light.display_session import BleDisplaySession
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def keepalive_session(emulator: BleEmulator, metrics: MetricsRecorder) -> BleDisplaySession:
+    return BleDisplaySession(
+        ADDRESS,
+        transport_factory=emulator.transport_factory,
+        metrics=metrics,
+        reconnect_delay=0.01,
+        keepalive=True,
+        keepalive_interval=1.0,
+    )
+
+
+def test_dropped_link_is_reconnected_before_the_next_send():
+    async def scenario():
+        emulator = BleEmulator(LinkProfile(latency=0.002), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        metrics = MetricsRecorder([])
+        async with keepalive_session(emulator, metrics) as session:
+            emulator.drop_link(ADDRESS)
+            await asyncio.sleep(0.2)
+            connected = session.transport.is_connected
+            await session.send_image(Image.new("RGB", (32, 32), (0, 0, 255)), delay=0.0)
+        return connected, panel, metrics.snapshot()[ADDRESS]["counters"]
+
+    connected, panel, counters = asyncio.run(scenario())
+    assert connected
+    assert panel.connections == 2
+    assert panel.frames_received == 1
+    assert counters["keepalive_reconnects"] == 1
+    assert "recovery_reconnects" not in counters
+
+
+def test_idle_link_is_pinged():
+    async def scenario():
+        emulator = BleEmulator(LinkProfile(latency=0.002), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        metrics = MetricsRecorder([])
+        async with keepalive_session(emulator, metrics):
+            await asyncio.sleep(1.2)
+        return panel, metrics.snapshot()[ADDRESS]["counters"]
+
+    panel, counters = asyncio.run(scenario())
+    assert counters["keepalive_pings"] == 1
+    assert "keepalive_failures" not in counters
+    assert panel.connections == 1
@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from PIL import Image
+from bk_light.display_session import ACK_STAGE_ONE, ACK_STAGE_THREE, BleDisplaySession, CircuitOpenError
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+from emulated import lossy_factory, rejecting_factory
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def deliver(drops: dict[bytes, int]) -> tuple[dict[str, float], int]:
+    async def scenario() -> tuple[dict[str, float], int]:
+        emulator = BleEmulator(LinkProfile(latency=0.001), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        metrics = MetricsRecorder([])
+        session = BleDisplaySession(
+            ADDRESS,
+            transport_factory=lossy_factory(emulator, drops),
+            metrics=metrics,
+            reconnect_delay=0.01,
+            ack_timeout=0.1,
+        )
+        async with session:
+            await session.send_image(Image.new("RGB", (32, 32), (0, 90, 0)), delay=0.0)
+        return metrics.snapshot()[ADDRESS]["counters"], panel.frames_received
+
+    return asyncio.run(scenario())
+
+
+def test_lost_frame_ack_is_resent_on_the_same_link():
+    counters, frames = deliver({ACK_STAGE_THREE: 1})
+    assert counters["recovery_resends"] == 1
+    assert "recovery_reconnects" not in counters
+    assert frames == 2
+
+
+def test_lost_handshake_ack_rehandshakes_without_reconnecting():
+    counters, frames = deliver({ACK_STAGE_ONE: 1})
+    assert counters["recovery_handshakes"] == 1
+    assert "recovery_reconnects" not in counters
+    assert frames == 1
+
+
+def test_repeated_frame_ack_loss_climbs_the_ladder():
+    counters, _frames = deliver({ACK_STAGE_THREE: 2})
+    assert counters["recovery_resends"] == 1
+    assert counters["recovery_handshakes"] == 1
+    assert "recovery_reconnects" not in counters
+
+
+def test_exhausted_ladder_reconnects():
+    counters, _frames = deliver({ACK_STAGE_THREE: 4})
+    assert counters["recovery_resends"] == 2
+    assert counters["recovery_handshakes"] == 1
+    assert counters["recovery_reconnects"] == 1
+    assert counters["retries"] == 4
+    assert counters["frames_sent"] == 1
+
+
+def test_breaker_opens_after_repeated_failures():
+    async def scenario() -> None:
+        emulator = BleEmulator(scan_time=0.0)
+        session = BleDisplaySession(
+            ADDRESS,
+            transport_factory=emulator.transport_factory,
+            max_retries=0,
+            breaker_threshold=2,
+            breaker_cooldown=60.0,
+        )
+        for _attempt in range(2):
+            with pytest.raises(Exception) as error:
+                await session.send_frame(b"\x00", delay=0.0)
+            assert not isinstance(error.value, CircuitOpenError)
+        with pytest.raises(CircuitOpenError):
+            await session.send_frame(b"\x00", delay=0.0)
+        assert session.breaker.trips == 1
+
+    asyncio.run(scenario())
+
+
+def test_rejected_chunking_falls_back_on_the_same_link():
+    async def scenario() -> None:
+        emulator = BleEmulator(LinkProfile(latency=0.001, accepts_chunks=False), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        metrics = MetricsRecorder([])
+        session = BleDisplaySession(ADDRESS, transport_factory=emulator.transport_factory, metrics=metrics, max_retries=0)
+        async with session:
+            for seed in range(2):
+                noise = Image.effect_noise((32, 32), 64 + seed).convert("RGB")
+                await session.send_image(noise, delay=0.0)
+        counters = metrics.snapshot()[ADDRESS]["counters"]
+        assert counters["chunk_fallbacks"] == 1
+        assert "recovery_reconnects" not in counters
+        assert session.chunking_disabled
+        assert panel.frames_received == 2
+        assert panel.connections == 1
+
+    asyncio.run(scenario())
+
+
+def test_chunk_rejected_mid_frame_resets_the_link_before_falling_back():
+    async def scenario() -> None:
+        emulator = BleEmulator(LinkProfile(latency=0.001), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        metrics = MetricsRecorder([])
+        session = BleDisplaySession(
+            ADDRESS,
+            transport_factory=rejecting_factory(emulator, [3]),
+            metrics=metrics,
+            reconnect_delay=0.01,
+            ack_timeout=0.1,
+        )
+        async with session:
+            for seed in range(2):
+                noise = Image.effect_noise((32, 32), 64 + seed).convert("RGB")
+                await session.send_image(noise, delay=0.0)
+        counters = metrics.snapshot()[ADDRESS]["counters"]
+        assert counters["chunk_fallbacks"] == 1
+        assert counters["recovery_reconnects"] == 1
+        assert "ack_timeouts" not in counters
+        assert session.chunking_disabled
+        assert panel.crc_errors == 0
+        assert panel.frames_received == 2
+        assert panel.connections == 2
+
+    asyncio.run(scenario())
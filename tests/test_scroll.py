@@ -0,0 +1,27 @@
+from bk_light.scroll import ScrollClock
+
+
+def drive(clock: ScrollClock, frame_time: float, frames: int) -> None:
+    now = clock.started
+    for _frame in range(frames):
+        clock.advance(now)
+        now += frame_time
+
+
+def test_on_schedule_scroll_skips_nothing():
+    clock = ScrollClock(24.0, 0.05, 1)
+    drive(clock, 0.05, 200)
+    assert clock.skipped == 0
+
+
+def test_on_schedule_scroll_with_coarse_step_skips_nothing():
+    clock = ScrollClock(30.0, 0.04, 3)
+    drive(clock, 0.04, 200)
+    assert clock.skipped == 0
+
+
+def test_slow_link_skips_positions_but_keeps_speed():
+    clock = ScrollClock(24.0, 0.05, 1)
+    drive(clock, 0.25, 41)
+    assert clock.last_position == 240
+    assert clock.skipped > 0
@@ -0,0 +1,48 @@
+import asyncio
+from PIL import Image
+from bk_light.config import AppConfig, DeviceConfig, DisplayConfig
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+from bk_light.panel_manager import PanelManager
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def repeat(refresh_interval: float = 30.0, pause: float = 0.0, drop: bool = False) -> tuple[int, dict[str, float]]:
+    async def scenario() -> tuple[int, dict[str, float]]:
+        emulator = BleEmulator(LinkProfile(latency=0.002), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        config = AppConfig(
+            device=DeviceConfig(address=ADDRESS, reconnect_delay=0.01),
+            display=DisplayConfig(skip_unchanged=True, refresh_interval=refresh_interval),
+        )
+        metrics = MetricsRecorder([])
+        image = Image.new("RGB", (32, 32), (0, 200, 0))
+        async with PanelManager(config, transport_factory=emulator.transport_factory, metrics=metrics) as manager:
+            await manager.send_image(image, delay=0.0)
+            await asyncio.sleep(pause)
+            if drop:
+                emulator.drop_link(ADDRESS)
+            await manager.send_image(image, delay=0.0)
+        return panel.frames_received, metrics.snapshot()[ADDRESS]["counters"]
+
+    return asyncio.run(scenario())
+
+
+def test_identical_tile_is_skipped():
+    frames, counters = repeat()
+    assert frames == 1
+    assert counters["frames_skipped"] == 1
+
+
+def test_identical_tile_is_refreshed_after_the_interval():
+    frames, counters = repeat(refresh_interval=0.05, pause=0.1)
+    assert frames == 2
+    assert "frames_skipped" not in counters
+
+
+def test_identical_tile_is_resent_after_a_reconnect():
+    frames, counters = repeat(drop=True)
+    assert frames == 2
+    assert "frames_skipped" not in counters
+    assert counters["reconnects"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+from PIL import Image
+from bk_light.display_session import ACK_STAGE_THREE, BleDisplaySession
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+from emulated import lossy_factory
+
+ADDRESS = "BE:00:00:00:00:01"
+
+
+def stream(frames: int, lose_ack_at: int = -1) -> tuple[int, int, dict[str, float]]:
+    async def scenario() -> tuple[int, int, dict[str, float]]:
+        emulator = BleEmulator(LinkProfile(latency=0.001), seed=1)
+        panel = emulator.add_panel(ADDRESS)
+        drops: dict[bytes, int] = {}
+        metrics = MetricsRecorder([])
+        session = BleDisplaySession(
+            ADDRESS,
+            transport_factory=lossy_factory(emulator, drops),
+            metrics=metrics,
+            streaming=True,
+            ack_timeout=0.1,
+        )
+        async with session:
+            for index in range(frames):
+                if index == lose_ack_at:
+                    drops[ACK_STAGE_THREE] = 1
+                await session.send_image(Image.new("RGB", (32, 32), (index * 10, 0, 0)), delay=0.0)
+        return panel.handshakes, panel.frames_received, metrics.snapshot()[ADDRESS]["counters"]
+
+    return asyncio.run(scenario())
+
+
+def test_streaming_handshakes_once_per_connection():
+    handshakes, frames, counters = stream(6)
+    assert handshakes == 1
+    assert frames == 6
+    assert counters["frames_sent"] == 6
+
+
+def test_lost_frame_ack_resynchronises_with_a_full_handshake():
+    handshakes, _frames, counters = stream(6, lose_ack_at=3)
+    assert handshakes == 2
+    assert counters["stream_resyncs"] == 1
+    assert counters["frames_sent"] == 6
+    assert "recovery_reconnects" not in counters
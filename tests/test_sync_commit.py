@@ -0,0 +1,67 @@
+import asyncio
+from typing import Optional
+from PIL import Image
+from bk_light.config import AppConfig, DeviceConfig, DisplayConfig, PanelDescriptor, PanelsConfig
+from bk_light.emulator import BleEmulator, LinkProfile
+from bk_light.metrics import MetricsRecorder
+from bk_light.panel_manager import PanelManager
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+
+
+def build_wall(sync_timeout: float) -> AppConfig:
+    items = [
+        PanelDescriptor(
+            name=f"panel_{index + 1}",
+            address=f"BE:00:00:00:00:{index:02X}",
+            grid_x=index % 2,
+            grid_y=index // 2,
+        )
+        for index in range(4)
+    ]
+    return AppConfig(
+        device=DeviceConfig(reconnect_delay=0.01, brightness=1.0),
+        display=DisplayConfig(sync_commit=True, sync_timeout=sync_timeout, skip_unchanged=False),
+        panels=PanelsConfig(columns=2, rows=2, items=items),
+    )
+
+
+def quadrants() -> Image.Image:
+    image = Image.new("RGB", (64, 64))
+    for index, color in enumerate(COLORS):
+        left = (index % 2) * 32
+        top = (index // 2) * 32
+        image.paste(color, (left, top, left + 32, top + 32))
+    return image
+
+
+def run_wall(sync_timeout: float, slow: Optional[str] = None) -> tuple[PanelManager, BleEmulator, dict]:
+    async def scenario() -> tuple[PanelManager, BleEmulator, dict]:
+        config = build_wall(sync_timeout)
+        emulator = BleEmulator(LinkProfile(latency=0.002, jitter=0.001), seed=3)
+        for descriptor in config.panels.items:
+            latency = 0.25 if descriptor.address == slow else 0.002
+            emulator.add_panel(descriptor.address, profile=LinkProfile(latency=latency))
+        metrics = MetricsRecorder([])
+        async with PanelManager(config, transport_factory=emulator.transport_factory, metrics=metrics) as manager:
+            await manager.send_image(quadrants(), delay=0.0)
+        return manager, emulator, metrics.snapshot()
+
+    return asyncio.run(scenario())
+
+
+def test_synchronized_commit_reports_skew():
+    manager, emulator, _snapshot = run_wall(1.0)
+    assert manager.last_skew is not None
+    assert manager.last_skew < 0.05
+    for index, color in enumerate(COLORS):
+        assert emulator.displayed(f"BE:00:00:00:00:{index:02X}").getpixel((16, 16)) == color
+
+
+def test_slow_panel_misses_barrier_without_blocking_the_wall():
+    slow = "BE:00:00:00:00:03"
+    manager, emulator, snapshot = run_wall(0.05, slow)
+    assert snapshot["wall"]["counters"]["barrier_timeouts"] == 1
+    assert manager.last_skew is not None
+    for index, color in enumerate(COLORS):
+        assert emulator.displayed(f"BE:00:00:00:00:{index:02X}").getpixel((16, 16)) == color